@@ -0,0 +1,301 @@
+"""Headless session benchmark for app.py with regression thresholds.
+
+Replays scripted user sessions through streamlit.testing AppTest:
+  browse      every chapter, then every condition in it
+  calculator  event dates, both units and a range of periods
+  search      typical free-text queries
+  tloc        every presentation for both licence groups
+  appendix    open and close each Appendix D section
+  facets      combine and clear the sidebar filters
+
+Every rerun records wall time, script time, peak Python memory, the number of
+ForwardMsgs and elements sent and their size. The first load in the process
+(imports, cache fills, index builds) is timed once on its own as
+cold_load_script_ms; after it, timings are the median of --repeat warm passes
+and memory comes from one more pass under tracemalloc.
+Results go to a JSON file. Limits come from THRESHOLDS, a --thresholds JSON file or
+--limit name=value. With --baseline, a previous results file also fails the
+run when a metric regresses by more than --tolerance. Exits 1 on any failure.
+
+Usage: python benchmarks/bench_app.py [--out bench_app.json] [--repeat 3] [--baseline old.json]
+                                      [--tolerance 0.25] [--limit script_ms_p95=40]
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+import streamlit
+
+from bench_reruns import RAN, ROOT, SENT, widget  # noqa: E402  (installs the counters)
+from dvla.store import GuidelineStore  # noqa: E402
+from dvla.tloc import PATHWAYS  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# Summary metric -> upper limit. Bytes and elements are per rerun.
+THRESHOLDS = {
+    "cold_load_script_ms": 2_000,
+    "load_script_ms": 250,
+    "load_bytes": 32_000,
+    "script_ms_p95": 40,
+    "wall_ms_p95": 120,
+    "bytes_p95": 12_000,
+    "bytes_max": 16_000,
+    "elements_max": 80,
+    "peak_kib_max": 1024,
+}
+# Metrics compared against --baseline (higher is worse).
+REGRESSION_METRICS = ("script_ms_p50", "script_ms_p95", "bytes_p95", "elements_max", "peak_kib_max")
+SEARCHES = ["blackout at the wheel", "hypo twice", "osa", "epilpesy", "icd shock", "cough syncope", "stroke"]
+
+
+# --- SESSION DRIVER ---
+class Session:
+    def __init__(self, app, memory):
+        self.at = AppTest.from_file(str(app), default_timeout=60)
+        self.memory = memory
+        self.name = "load"
+        self.reruns = []
+        self.expanded = {}
+
+    def widget_states(self):
+        # AppTest has no expander API and only serialises widgets in the last
+        # tree; add every expander state the browser would send.
+        states = self.at._tree.get_widget_states()
+        for widget_id, value in self.expanded.items():
+            state = next((w for w in states.widgets if w.id == widget_id), None) or states.widgets.add()
+            state.id, state.bool_value = widget_id, value
+        return states
+
+    def rerun(self, step):
+        at = self.at
+        states = self.widget_states()
+        SENT.clear(), RAN.clear()
+        if self.memory:
+            tracemalloc.reset_peak()
+            floor = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        at._run(states)
+        wall = time.perf_counter() - t0
+        if at.exception:
+            raise SystemExit(f"{self.name} / {step}: {at.exception[0].message}")
+        elements = sum(1 for kind, _ in SENT if kind == "delta")
+        self.reruns.append({
+            "session": self.name, "step": step,
+            "wall_ms": round(wall * 1e3, 3), "script_ms": round(sum(RAN) * 1e3, 3),
+            "peak_kib": round((tracemalloc.get_traced_memory()[1] - floor) / 1024, 1) if self.memory else None,
+            "messages": len(SENT), "elements": elements, "bytes": sum(size for _, size in SENT),
+        })
+
+    def find(self, kind, label):
+        # After a fragment rerun the tree only holds that fragment's elements.
+        w = widget(self.at, kind, label)
+        if w is None:
+            self.rerun("full rerun")
+            w = widget(self.at, kind, label)
+        if w is None:
+            raise SystemExit(f"{self.name}: no {kind} labelled {label!r}")
+        return w
+
+    def set(self, kind, label, value, step=None):
+        w = self.find(kind, label)
+        if w.value == value:
+            return
+        w.set_value(value)
+        self.rerun(step or f"{label.strip(' :')} = {value}")
+
+    def expander(self, label, open_):
+        for e in self.at.expander:
+            if e.label == label:
+                break
+        else:
+            self.rerun("full rerun")
+            e = next(e for e in self.at.expander if e.label == label)
+        self.expanded[e.proto.id] = open_
+        self.rerun(f"{'open' if open_ else 'close'} {label.strip()}")
+
+
+def browse(s, data):
+    for chap, entry in data.items():
+        s.set("selectbox", "📁 System Chapter", chap, f"chapter {chap}")
+        for cond in entry["conditions"]:
+            s.set("selectbox", "🔬 Clinical Condition", cond, f"condition {cond}")
+
+
+def calculator(s, data):
+    for days in (0, 1, 30, 365, 3 * 365):
+        s.set("date_input", "🗓️ Date of Event", date(2026, 1, 31) - timedelta(days=days))
+    for unit in ("Months", "Weeks"):
+        s.set("radio", "Unit", unit)
+        for num in (0, 1, 3, 6, 12, 52):
+            s.set("number_input", "No.", num)
+
+
+def search(s, data):
+    for query in SEARCHES:
+        s.set("text_input", "🔎 Search", query)
+    s.set("text_input", "🔎 Search", "", "clear search")
+
+
+def tloc(s, data):
+    for group in (1, 2):
+        s.set("radio", "Licence", group)
+        for pathway in PATHWAYS:
+            s.set("selectbox", "Presentation", pathway, f"presentation {pathway}")
+
+
+def appendix(s, data):
+    from dvla.appendix import APPENDIX_D
+    for title, _ in APPENDIX_D:
+        s.expander(title, True)
+    for title, _ in APPENDIX_D:
+        s.expander(title, False)
+
+
+def facets(s, data):
+    s.set("checkbox", "Group 2 revoked or permanently barred", True)
+    s.set("multiselect", "Notifiable (Group 1)", ["yes"])
+    for months in (1, 6, 12, 60, None):
+        s.set("selectbox", "Group 1 off for at least", months)
+    s.set("multiselect", "Exclude chapter", list(data)[:2])
+    s.set("multiselect", "Chapter", list(data)[:4])
+    for kind, label, value in (("multiselect", "Chapter", []), ("multiselect", "Exclude chapter", []),
+                               ("multiselect", "Notifiable (Group 1)", []), ("checkbox", "Group 2 revoked", False)):
+        s.set(kind, label, value)
+
+
+SESSIONS = {"browse": browse, "calculator": calculator, "search": search, "tloc": tloc, "appendix": appendix, "facets": facets}
+
+
+def run_sessions(app, data, memory):
+    s = Session(app, memory)
+    s.rerun("initial load")
+    for name, script in SESSIONS.items():
+        s.name = name
+        script(s, data)
+    return s.reruns
+
+
+# --- SUMMARY & THRESHOLDS ---
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def summarise(reruns, cold):
+    load = reruns[0]
+    rest = [r for r in reruns[1:] if r["step"] != "full rerun"]
+    col = lambda key: [r[key] for r in rest]  # noqa: E731
+    summary = {
+        "reruns": len(rest),
+        "cold_load_script_ms": cold["script_ms"],
+        "load_script_ms": load["script_ms"], "load_bytes": load["bytes"],
+        "wall_ms_p50": statistics.median(col("wall_ms")), "wall_ms_p95": percentile(col("wall_ms"), .95),
+        "script_ms_p50": statistics.median(col("script_ms")), "script_ms_p95": percentile(col("script_ms"), .95),
+        "bytes_p50": statistics.median(col("bytes")), "bytes_p95": percentile(col("bytes"), .95),
+        "bytes_max": max(col("bytes")), "elements_max": max(col("elements")),
+        "peak_kib_max": max(col("peak_kib")),
+    }
+    sessions = {}
+    for name in SESSIONS:
+        rows = [r for r in rest if r["session"] == name]
+        sessions[name] = {
+            "reruns": len(rows),
+            "script_ms_p50": statistics.median(r["script_ms"] for r in rows),
+            "bytes_p50": statistics.median(r["bytes"] for r in rows),
+            "peak_kib_max": max(r["peak_kib"] for r in rows),
+        }
+    return summary, sessions
+
+
+def check(summary, limits, baseline, tolerance):
+    failures = [
+        f"{metric} = {summary[metric]:,} exceeds limit {limit:,}"
+        for metric, limit in limits.items() if summary[metric] > limit
+    ]
+    if baseline:
+        for metric in REGRESSION_METRICS:
+            old, new = baseline["summary"].get(metric), summary[metric]
+            if old and new > old * (1 + tolerance):
+                failures.append(f"{metric} regressed {old:,} -> {new:,} (+{new / old - 1:.0%}, tolerance {tolerance:.0%})")
+    return failures
+
+
+def parse_limit(text):
+    name, _, value = text.partition("=")
+    if name not in THRESHOLDS or not value:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(THRESHOLDS)} as name=value")
+    return name, float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default=str(ROOT / "app.py"))
+    parser.add_argument("--out", default="bench_app.json")
+    parser.add_argument("--repeat", type=int, default=3, help="timing passes; each rerun reports the median")
+    parser.add_argument("--thresholds", help="JSON file of {metric: limit} overriding the defaults")
+    parser.add_argument("--limit", type=parse_limit, action="append", default=[], metavar="NAME=VALUE")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression vs --baseline")
+    args = parser.parse_args()
+
+    limits = dict(THRESHOLDS)
+    if args.thresholds:
+        limits.update(json.loads(Path(args.thresholds).read_text()))
+    limits.update(args.limit)
+    unknown = set(limits) - set(THRESHOLDS)
+    if unknown:
+        parser.error(f"unknown threshold(s): {', '.join(sorted(unknown))}")
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+
+    guidelines = GuidelineStore().snapshot
+    app = Path(args.app).resolve()
+    t0 = time.perf_counter()
+    # Warm-up: the first run pays for imports, so it must not feed the medians.
+    cold = Session(app, memory=False)
+    cold.rerun("cold load")
+    cold = cold.reruns[0]
+    passes = [run_sessions(app, guidelines.data, memory=False) for _ in range(args.repeat)]
+    reruns = passes[0]
+    for i, row in enumerate(reruns):
+        for key in ("wall_ms", "script_ms"):
+            row[key] = statistics.median(p[i][key] for p in passes)
+    tracemalloc.start()
+    traced = run_sessions(app, guidelines.data, memory=True)
+    tracemalloc.stop()
+    for row, mem in zip(reruns, traced):
+        row["peak_kib"] = mem["peak_kib"]
+    summary, sessions = summarise(reruns, cold)
+    failures = check(summary, limits, baseline, args.tolerance)
+
+    result = {
+        "app": str(app), "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(), "streamlit": streamlit.__version__,
+        "guidelines": {"version": guidelines.version, "digest": guidelines.digest},
+        "thresholds": limits, "baseline": args.baseline, "tolerance": args.tolerance,
+        "summary": summary, "sessions": sessions, "failures": failures, "reruns": reruns,
+    }
+    Path(args.out).write_text(json.dumps(result, indent=1))
+
+    print(f"{summary['reruns']} reruns in {time.perf_counter() - t0:.1f} s -> {args.out}")
+    print(f"{'session':<12} {'reruns':>7} {'script ms p50':>14} {'bytes p50':>10} {'peak KiB':>9}")
+    for name, row in sessions.items():
+        print(f"{name:<12} {row['reruns']:>7} {row['script_ms_p50']:>14.1f} {row['bytes_p50']:>10,.0f} {row['peak_kib_max']:>9,.0f}")
+    print(f"cold load: {summary['cold_load_script_ms']:.0f} ms  "
+          f"initial load: {summary['load_script_ms']:.0f} ms, {summary['load_bytes']:,} bytes  "
+          f"per rerun: script p95 {summary['script_ms_p95']:.1f} ms, wall p95 {summary['wall_ms_p95']:.1f} ms, "
+          f"bytes max {summary['bytes_max']:,}")
+    if failures:
+        print(f"{len(failures)} THRESHOLD FAILURE(S):", *failures, sep="\n  ")
+        return 1
+    print("all thresholds met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Throughput of the medical entry audit log under concurrent writers.
+
+Each writer thread plays one session per round. It records an entry a few
+times, as repeated "Record entry" clicks do, and only every --repeat-th record
+is a new entry. The write-behind AuditLog is measured against a synchronous
+INSERT+COMMIT per entry over a shared connection, which is the naive
+alternative. Both skip repeated entries the same way, so they write the same
+rows. The benchmark reports the latency of each call on the page's thread and
+the sustained rows/s until everything is on disk.
+
+Usage: python benchmarks/bench_audit.py [--writers 16] [--entries 5000] [--repeat 3]
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.audit import INSERT, AuditLog, _connect  # noqa: E402
+from dvla.core import medical_entry  # noqa: E402
+from dvla.resume import add_period  # noqa: E402
+from dvla.store import GuidelineStore  # noqa: E402
+
+
+class SyncLog:
+    """One INSERT and COMMIT per entry, serialised on a lock, with AuditLog's repeat de-duplication."""
+
+    def __init__(self, path):
+        self.conn = _connect(path)
+        self.lock = threading.Lock()
+        self.last = {}
+
+    def record(self, session, chapter, condition, guidelines, event_date, num, unit, resume_date, entry):
+        key = (chapter, condition, guidelines.digest, entry)
+        row = (time.strftime("%Y-%m-%dT%H:%M:%S"), session, chapter, condition, guidelines.version,
+               guidelines.digest, event_date.isoformat(), num, unit, resume_date.isoformat(), entry)
+        with self.lock:
+            if self.last.get(session) == key:
+                return False
+            self.last[session] = key
+            with self.conn:
+                self.conn.execute(INSERT, row)
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.conn.close()
+
+
+def workload(guidelines, writer, entries, repeat):
+    conditions = [(chap, name, res) for chap, e in guidelines.data.items() for name, res in e["conditions"].items()]
+    for i in range(entries):
+        chap, cond, res = conditions[(writer * 7 + i) % len(conditions)]
+        event = date(2026, 1, 1) + timedelta(days=i % 365)
+        num, unit = 1 + i % 12, "Months"
+        resume = add_period(event, num, unit)
+        args = (f"session-{writer}", chap, cond, guidelines, event, num, unit, resume,
+                medical_entry(cond, res, num, unit, event, resume))
+        for _ in range(repeat):
+            yield args
+
+
+def run(log, guidelines, writers, entries, repeat):
+    latencies = [[] for _ in range(writers)]
+    calls = [list(workload(guidelines, w, entries, repeat)) for w in range(writers)]
+    start = threading.Barrier(writers + 1)
+
+    def writer(w):
+        out, record, clock = latencies[w], log.record, time.perf_counter
+        start.wait()
+        for args in calls[w]:
+            t0 = clock()
+            record(*args)
+            out.append(clock() - t0)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    rendered = time.perf_counter() - t0
+    log.flush()
+    durable = time.perf_counter() - t0
+    return sorted(x for lat in latencies for x in lat), rendered, durable
+
+
+def rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--entries", type=int, default=5000, help="distinct entries per writer")
+    parser.add_argument("--repeat", type=int, default=3, help="records per entry (repeated clicks)")
+    args = parser.parse_args()
+
+    guidelines = GuidelineStore().snapshot
+    calls = args.writers * args.entries * args.repeat
+    print(f"{args.writers} writers x {args.entries:,} entries x {args.repeat} records = {calls:,} record() calls")
+    print(f"{'log':<14} {'p50 us':>8} {'p99 us':>8} {'max ms':>8} {'records/s':>11} {'rows/s on disk':>15} {'rows':>8}")
+    written = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make in (("write-behind", AuditLog), ("sync commit", SyncLog)):
+            path = Path(tmp) / f"{name}.sqlite3"
+            log = make(path)
+            lat, rendered, durable = run(log, guidelines, args.writers, args.entries, args.repeat)
+            log.close()
+            n = written[name] = rows(path)
+            pct = lambda p: lat[min(len(lat) - 1, int(len(lat) * p))]  # noqa: E731
+            print(f"{name:<14} {pct(.5) * 1e6:>8.1f} {pct(.99) * 1e6:>8.1f} {lat[-1] * 1e3:>8.2f} "
+                  f"{calls / rendered:>11,.0f} {n / durable:>15,.0f} {n:>8,}")
+            if name == "write-behind":
+                stats = log.stats
+                print(f"{'':<14} {stats['batches']:,} batches, {stats['deduplicated']:,} repeat records skipped")
+    if len(set(written.values())) != 1:
+        raise SystemExit(f"logs wrote different row counts: {written}")
+
+
+if __name__ == "__main__":
+    main()
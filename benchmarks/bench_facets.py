@@ -0,0 +1,95 @@
+"""Facet bitset index vs linear scans on a synthetic condition set.
+
+Builds --size conditions by resampling the real guideline fields across 100
+synthetic chapters. Each query is then answered three ways:
+- the FacetIndex;
+- a scan over pre-normalised rows;
+- a scan that re-reads the raw guideline text, which is all DVLA_DATA offers.
+Match counts are checked against each other.
+
+Usage: python benchmarks/bench_facets.py [--size 100000] [--rounds 20]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.facets import BUCKET_EDGES, BUCKETS, Facet, FacetIndex, at_least, attributes  # noqa: E402
+from dvla.store import GuidelineStore  # noqa: E402
+
+CARDIO = "Chapter 2: Cardiovascular"
+
+
+def synthetic(size, seed=0):
+    real = [res for entry in GuidelineStore().snapshot.data.values() for res in entry["conditions"].values()]
+    rng = random.Random(seed)
+    data = {}
+    for i in range(size):
+        chapter = f"{CARDIO} {i % 100}" if i % 100 < 12 else f"Chapter {i % 100}: Synthetic"
+        res = {field: rng.choice(real)[field] for field in ("g1", "g2", "notif", "ref")}
+        data.setdefault(chapter, {"title": chapter, "url": "https://example.invalid", "conditions": {}})
+        data[chapter]["conditions"][f"Condition {i}"] = res
+    return data
+
+
+SIX_MONTHS_PLUS = {*BUCKETS[BUCKET_EDGES.index(6):], "indefinite"}
+# name -> (facet filter, predicate over a {facet: value} row)
+QUERIES = {
+    "G2 revoked or permanent bar": (
+        Facet("revoked_g2") | Facet("permanent_g2"),
+        lambda r: "revoked_g2" in r or "permanent_g2" in r,
+    ),
+    "cardio & notifiable G1 & >=6m G1": (
+        Facet("chapter", *[f"{CARDIO} {k}" for k in range(12)]) & Facet("notifiable_g1", "yes") & at_least(1, 6),
+        lambda r: r["chapter"].startswith(CARDIO) and r["notifiable_g1"] == "yes" and r["cessation_g1"] in SIX_MONTHS_PLUS,
+    ),
+    "NOT no-restriction G1 & notifiable G2": (
+        ~Facet("cessation_g1", "none") & Facet("notifiable_g2", "yes", "conditional"),
+        lambda r: r["cessation_g1"] != "none" and r["notifiable_g2"] in ("yes", "conditional"),
+    ),
+}
+
+
+def timed(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    data = synthetic(args.size)
+    t0 = time.perf_counter()
+    index = FacetIndex.from_data(data)
+    build = time.perf_counter() - t0
+    rows = [dict(attributes(chapter, res)) for chapter, entry in data.items() for res in entry["conditions"].values()]
+    raw = [(chapter, res) for chapter, entry in data.items() for res in entry["conditions"].values()]
+    bytes_ = sum((b.bit_length() + 7) // 8 for b in index._bits.values())
+    print(f"{len(index):,} conditions, {len(index._bits)} facet values, "
+          f"index build {build * 1e3:.0f} ms, bitsets {bytes_ / 1024:,.0f} KiB")
+    print(f"{'query':<38} {'matches':>8} {'bitset count':>13} {'bitset select':>14} {'scan rows':>10} {'scan raw':>9}")
+
+    for name, (flt, pred) in QUERIES.items():
+        t_count, n = timed(lambda: index.count(flt), args.rounds)
+        t_select, keys = timed(lambda: index.select(flt), args.rounds)
+        t_rows, n_rows = timed(lambda: sum(1 for r in rows if pred(r)), max(1, args.rounds // 5))
+        t_raw, n_raw = timed(lambda: sum(1 for c, res in raw if pred(dict(attributes(c, res)))), 1)
+        if not n == len(keys) == n_rows == n_raw:
+            raise SystemExit(f"{name}: count mismatch {n} / {len(keys)} / {n_rows} / {n_raw}")
+        print(f"{name:<38} {n:>8,} {t_count * 1e6:>10.0f} us {t_select * 1e3:>11.2f} ms "
+              f"{t_rows * 1e3:>7.1f} ms {t_raw * 1e3:>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
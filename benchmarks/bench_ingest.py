@@ -0,0 +1,53 @@
+"""Timing of offline ingestion over the saved GOV.UK fixture pages.
+
+Times a cold run (every page parsed, in --workers processes) and a re-run
+with the pages unchanged (only the cached SHA-256 check, plus the saved error
+page, which is never cached). Each round starts from a fresh copy of the
+fixtures and guidelines. The diff itself is checked by tests/test_ingest.py.
+
+Usage: python benchmarks/bench_ingest.py [--workers 2] [--rounds 5]
+"""
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.ingest import ingest  # noqa: E402
+from dvla.store import DEFAULT_DIR  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures" / "govuk"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    cold, warm = [], []
+    for _ in range(args.rounds):
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshots, guidelines = Path(tmp) / "snapshots", Path(tmp) / "guidelines"
+            shutil.copytree(FIXTURES, snapshots)
+            shutil.copytree(DEFAULT_DIR, guidelines)
+
+            t0 = time.perf_counter()
+            report = ingest(snapshots, guidelines, workers=args.workers)
+            cold.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            ingest(snapshots, guidelines, workers=args.workers)
+            warm.append(time.perf_counter() - t0)
+
+    print(f"{len(report.parsed)} pages, {args.workers} workers, {args.rounds} rounds")
+    print(f"cold run {statistics.median(cold) * 1e3:.0f} ms (median), "
+          f"unchanged re-run {statistics.median(warm) * 1e3:.1f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
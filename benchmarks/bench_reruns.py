@@ -0,0 +1,141 @@
+"""Per-interaction rerun cost of app.py: script time and bytes sent.
+
+Drives the app headlessly with streamlit.testing AppTest, times the script
+runner thread (AppTest's own polling is excluded) and counts the serialized
+size of every ForwardMsg the run enqueues for the browser.
+Widgets are found by label so the same script also runs against older
+revisions of app.py (e.g. ``git show <rev>:app.py > old_app.py``).
+
+Usage: python benchmarks/bench_reruns.py [--app app.py] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# Keep scripted sessions out of the real audit log.
+os.environ.setdefault("DVLA_AUDIT_DB", str(Path(tempfile.mkdtemp()) / "audit.sqlite3"))
+
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue  # noqa: E402
+from streamlit.runtime.scriptrunner.script_runner import ScriptRunner  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner  # noqa: E402
+
+SENT, RAN = [], []
+_enqueue = ForwardMsgQueue.enqueue
+_run_script = ScriptRunner._run_script
+
+
+def _counting_enqueue(self, msg):
+    SENT.append((msg.WhichOneof("type"), msg.ByteSize()))
+    return _enqueue(self, msg)
+
+
+def _timed_run_script(self, rerun_data):
+    t0 = time.perf_counter()
+    try:
+        return _run_script(self, rerun_data)
+    finally:
+        RAN.append(time.perf_counter() - t0)
+
+
+ForwardMsgQueue.enqueue = _counting_enqueue
+ScriptRunner._run_script = _timed_run_script
+# AppTest builds a fresh ScriptCache per run, recompiling app.py each time;
+# a server keeps one, so share it to time the script rather than the compiler.
+_script_cache = app_test.ScriptCache()
+app_test.ScriptCache = local_script_runner.ScriptCache = lambda: _script_cache
+
+
+def sent_bytes():
+    return sum(size for _, size in SENT)
+
+
+def widget(at, kind, label):
+    for w in getattr(at, kind):
+        if w.label.startswith(label):
+            return w
+    return None
+
+
+# A step prepares one interaction and returns the rerun to time, or None
+# when this revision of the app has no such widget.
+def _set(kind, label, value):
+    def step(at):
+        w = widget(at, kind, label)
+        if w is None:
+            return None
+        w.set_value(value(w) if callable(value) else value)
+        return at.run
+    return step
+
+
+def _open_expander(label):
+    # AppTest has no expander API; send the same widget state the browser
+    # would. Only expanders that track state (keyed, with on_change) have one.
+    def step(at):
+        for e in at.expander:
+            if e.label.startswith(label) and e.proto.id:
+                states = at._tree.get_widget_states()
+                state = states.widgets.add()
+                state.id, state.bool_value = e.proto.id, True
+                return lambda: at._run(states)
+        return None
+    return step
+
+
+INTERACTIONS = [
+    ("calculator: event date", _set("date_input", "🗓️ Date of Event", lambda w: date(2026, 1, 31) if w.value != date(2026, 1, 31) else date(2026, 2, 1))),
+    ("calculator: unit", _set("radio", "Unit", lambda w: "Weeks" if w.value == "Months" else "Months")),
+    ("calculator: number", _set("number_input", "No.", lambda w: (w.value or 0) + 1)),
+    ("condition: chapter", _set("selectbox", "📁 System Chapter", lambda w: w.options[2] if w.value != w.options[2] else w.options[3])),
+    ("condition: search", _set("text_input", "🔎 Search", lambda w: "hypo twice" if w.value != "hypo twice" else "osa")),
+    ("tloc: presentation", _set("selectbox", "Presentation", lambda w: "cough" if w.value != "cough" else "unexplained")),
+    ("appendix: open section 3", _open_expander(" 3.")),
+]
+
+
+def measure(app, repeat):
+    at = AppTest.from_file(str(Path(app).resolve()), default_timeout=30)
+    SENT.clear(), RAN.clear()
+    at.run()
+    results = {"initial load": ([sum(RAN)], [sent_bytes()])}
+    for name, step in INTERACTIONS:
+        times, sizes = [], []
+        for _ in range(repeat):
+            at.run()  # full run so every widget is back in the element tree
+            rerun = step(at)
+            if rerun is None:
+                break
+            SENT.clear(), RAN.clear()
+            rerun()
+            times.append(sum(RAN))
+            sizes.append(sent_bytes())
+            if at.exception:
+                raise SystemExit(f"{name}: {at.exception[0].message}")
+        results[name] = (times, sizes)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default=str(ROOT / "app.py"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = measure(args.app, args.repeat)
+    print(f"{'interaction':<28} {'script ms':>10} {'bytes sent':>11}")
+    for name, (times, sizes) in results.items():
+        if not times:
+            print(f"{name:<28} {'n/a':>10} {'n/a':>11}")
+            continue
+        print(f"{name:<28} {statistics.median(times) * 1e3:>10.1f} {statistics.median(sizes):>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
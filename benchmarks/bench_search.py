@@ -0,0 +1,121 @@
+"""Search index benchmark over a synthetic corpus of thousands of conditions.
+
+Before timing, each query is run against the real guidelines and the script
+exits non-zero unless its top condition is one of the expected titles.
+
+Usage: python benchmarks/bench_search.py [--sizes 1000 5000 20000]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.appendix import APPENDIX_D  # noqa: E402
+from dvla.search import SearchIndex  # noqa: E402
+from dvla.store import GuidelineStore  # noqa: E402
+
+TLOC = ("Unexplained TLoC (Low Risk)", "Unexplained TLoC (High Risk)")
+# query -> acceptable top conditions (the two Unexplained TLoC entries tie)
+EXPECTED = {
+    "blackout on steering wheel": TLOC,
+    "blackout at the wheel": TLOC,
+    "collapse behind the wheel": TLOC,
+    "hypo twice": ("Severe Hypoglycaemia (x2 in 12m)",),
+    "OSA": ("Sleep Apnoea (OSA)",),
+    "sleep apnoea": ("Sleep Apnoea (OSA)",),
+    "faint while driving": ("Simple Vasovagal Syncope",),
+    "epilpesy": ("Epilepsy (Unprovoked)",),
+    "stroke recurrent": ("TIA / Stroke (Recurrent)",),
+    "icd shock": ("ICD (Symptomatic/Shock)",),
+    "glaucoma": ("Glaucoma (Advanced)",),
+    "cough syncope": ("Cough Syncope",),
+    "heart attack pci": ("ACS (PCI performed)",),
+    "alcohol dependence": ("Alcohol Dependence",),
+    "parkinsons": ("Parkinson's Disease",),
+    "unexplained tloc high risk": ("Unexplained TLoC (High Risk)",),
+    "meningioma surgery": ("Meningioma (Benign)",),
+}
+QUERIES = list(EXPECTED)
+QUALIFIERS = ["Acute", "Chronic", "Recurrent", "Single", "Treated", "Untreated", "Paediatric",
+              "Post-operative", "Severe", "Mild", "Type A", "Type B", "Stage I", "Stage II"]
+
+
+def synthetic_data(base, size, seed=0):
+    rng = random.Random(seed)
+    seeds = [(chap, name, res) for chap, entry in base.items() for name, res in entry["conditions"].items()]
+    data = {}
+    for i in range(size):
+        chap, name, res = rng.choice(seeds)
+        chapter = f"{chap} / Section {i % 40}"
+        entry = data.setdefault(chapter, {"url": base[chap]["url"], "conditions": {}})
+        entry["conditions"][f"{name} [{rng.choice(QUALIFIERS)} {i}]"] = dict(res)
+    return data
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def check_relevance(data, appendix):
+    index = SearchIndex.from_data(data, appendix)
+    failures = []
+    for q, expected in EXPECTED.items():
+        top = next((h.title for h in index.search(q) if h.kind == "condition"), None)
+        if top not in expected:
+            failures.append(f"{q!r}: top condition {top!r}, expected {' or '.join(map(repr, expected))}")
+    return failures
+
+
+def bench(data, appendix, rounds):
+    t0 = time.perf_counter()
+    index = SearchIndex.from_data(data, appendix)
+    build = time.perf_counter() - t0
+
+    cold, warm = [], []
+    for _ in range(rounds):
+        index._cache.clear()
+        index._expansions.clear()
+        for q in QUERIES:
+            t0 = time.perf_counter()
+            index.search(q)
+            cold.append(time.perf_counter() - t0)
+        for q in QUERIES:
+            t0 = time.perf_counter()
+            index.search(q)
+            warm.append(time.perf_counter() - t0)
+    return build, cold, warm
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 5000, 20000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    base, appendix = GuidelineStore().snapshot.data, APPENDIX_D
+    failures = check_relevance(base, appendix)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        return 1
+    print(f"relevance OK ({len(EXPECTED)} queries)\n")
+    print(f"{'conditions':>10} {'terms':>7} {'build ms':>9} {'uncached p50/p99 us':>20} {'rerun p50/p99 us':>17}")
+    for size in args.sizes:
+        data = synthetic_data(base, size) if size else base
+        n = sum(len(e["conditions"]) for e in data.values())
+        build, cold, warm = bench(data, appendix, args.rounds)
+        index = SearchIndex.from_data(data, appendix)
+        print(f"{n:>10} {len(index.postings):>7} {build * 1e3:>9.1f} "
+              f"{percentile(cold, .5) * 1e6:>9.0f}/{percentile(cold, .99) * 1e6:<10.0f} "
+              f"{statistics.median(warm) * 1e6:>7.1f}/{percentile(warm, .99) * 1e6:<9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Guideline store load/reload benchmark.
+
+Copies data/guidelines into a temp dir at 1x and 100x scale (each condition
+replicated with a suffix) and times a cold load, a no-op refresh, a touched
+but unchanged chapter, and a genuinely edited chapter.
+
+Usage: python benchmarks/bench_store.py [--scales 1 100]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.store import DEFAULT_DIR, MANIFEST, GuidelineStore  # noqa: E402
+
+
+def build_dataset(target, scale):
+    manifest = json.loads((DEFAULT_DIR / MANIFEST).read_text(encoding="utf-8"))
+    shutil.copy(DEFAULT_DIR / MANIFEST, target / MANIFEST)
+    total = 0
+    for name in manifest["chapters"]:
+        chapter = json.loads((DEFAULT_DIR / name).read_text(encoding="utf-8"))
+        if scale > 1:
+            chapter["conditions"] = {
+                f"{cond} #{i}": res for i in range(scale) for cond, res in chapter["conditions"].items()
+            }
+        total += len(chapter["conditions"])
+        (target / name).write_text(json.dumps(chapter, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest["chapters"], total
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e3
+
+
+def bench(scale, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp)
+        chapters, total = build_dataset(target, scale)
+        victim = target / chapters[1]
+        cold = timed(lambda: GuidelineStore(target), repeat)
+
+        store = GuidelineStore(target)
+        noop = timed(store.refresh, repeat * 10)
+        touched = timed(store.refresh, repeat, setup=lambda i: os.utime(victim))
+
+        chapter = json.loads(victim.read_text(encoding="utf-8"))
+        first = next(iter(chapter["conditions"].values()))
+        base_ref = first["ref"]
+
+        def edit(i):
+            first["ref"] = f"{base_ref} (rev {i})"
+            victim.write_text(json.dumps(chapter, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        parsed = store.stats["parsed"]
+        edited = timed(store.refresh, repeat, setup=edit)
+        assert store.stats["parsed"] - parsed == repeat  # only the edited chapter was reparsed
+        return total, cold, noop, touched, edited
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scale':>5} {'conditions':>10} {'cold ms':>8} {'no-op ms':>9} {'touched ms':>11} {'1 chapter edited ms':>20}")
+    for scale in args.scales:
+        total, cold, noop, touched, edited = bench(scale, args.repeat)
+        print(f"{scale:>4}x {total:>10} {cold:>8.2f} {noop:>9.3f} {touched:>11.3f} {edited:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
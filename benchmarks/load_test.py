@@ -0,0 +1,132 @@
+"""Load test for the dvla.api JSON service.
+
+Opens N keep-alive connections and fires a lookup/entry/search/resume mix for
+a fixed duration, then reports requests/sec and latency percentiles. By
+default a local instance is spawned on a free port; pass --port to target an
+already running one.
+
+Usage: python benchmarks/load_test.py [--connections 64] [--duration 10] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.store import GuidelineStore  # noqa: E402
+
+SEARCHES = ["blackout at the wheel", "hypo twice", "osa", "epilpesy", "icd shock", "cough syncope"]
+
+
+def request_mix(seed):
+    data = GuidelineStore().snapshot.data
+    names = [name for entry in data.values() for name in entry["conditions"]]
+    rng = random.Random(seed)
+    while True:
+        roll = rng.random()
+        cond = rng.choice(names)
+        if roll < 0.4:
+            yield "POST", "/lookup", {"condition": cond}
+        elif roll < 0.7:
+            yield "POST", "/entry", {"condition": cond, "event_date": "2026-03-01", "num": rng.randint(1, 12), "unit": "months"}
+        elif roll < 0.9:
+            yield "GET", f"/search?q={rng.choice(SEARCHES).replace(' ', '+')}&limit=5", None
+        else:
+            yield "POST", "/resume", {"event_date": "2026-03-01", "condition": cond, "group": rng.randint(1, 2)}
+
+
+def encode(method, path, body, host):
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+    return head.encode() + payload
+
+
+async def worker(host, port, deadline, mix, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = next(mix)
+            t0 = time.perf_counter()
+            writer.write(encode(method, path, body, host))
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode())
+    finally:
+        writer.close()
+
+
+async def run(host, port, connections, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        worker(host, port, deadline, request_mix(i), latencies, errors) for i in range(connections)
+    ))
+    return latencies, errors, time.perf_counter() - t0
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn(port):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "dvla.api", "--port", str(port)], cwd=ROOT,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    line = proc.stdout.readline()
+    if "listening" not in line:
+        proc.kill()
+        raise SystemExit(f"server failed to start: {line}{proc.stdout.read()}")
+    return proc
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="target a running server instead of spawning one")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    port = args.port or free_port()
+    proc = None if args.port else spawn(port)
+    try:
+        latencies, errors, elapsed = asyncio.run(run(args.host, port, args.connections, args.duration))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    latencies.sort()
+    ms = lambda s: f"{s * 1e3:.2f} ms"  # noqa: E731
+    print(f"connections: {args.connections}  duration: {elapsed:.1f} s  requests: {len(latencies):,}  errors: {len(errors)}")
+    print(f"throughput : {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency    : p50 {ms(percentile(latencies, .5))}  p90 {ms(percentile(latencies, .9))}  "
+          f"p99 {ms(percentile(latencies, .99))}  max {ms(latencies[-1])}")
+    if errors:
+        print(f"first errors: {errors[:3]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Timing of an exhaustive sweep of the Appendix D decision engine.
+
+Evaluates every combination of answers, with and without the resume date,
+and times the table compile and the whole sweep. Correctness against the
+published tables is checked by tests/test_tloc.py.
+
+Usage: python benchmarks/sweep_tloc.py [--rounds 1000]
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dvla.tloc import all_answers, compile_table, decide  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    compile_table()
+    compile_ms = (time.perf_counter() - t0) * 1e3
+
+    answers = list(all_answers())
+    event = date(2026, 1, 31)
+    n = args.rounds * len(answers)
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for a in answers:
+            decide(*a)
+    lookup = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for a in answers:
+            decide(*a).resume(event)
+    sweep = time.perf_counter() - t0
+
+    print(f"combinations: {len(answers)}  table compile: {compile_ms:.2f} ms")
+    print(f"full sweep: {sweep / args.rounds * 1e3:.3f} ms  "
+          f"({lookup / n * 1e9:.0f} ns per decision, {sweep / n * 1e9:.0f} ns with resume date)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Streamlit-free building blocks for the DVLA Clinical Standards app."""
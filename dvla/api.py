@@ -0,0 +1,272 @@
+"""Local HTTP/JSON service over ``dvla.core`` for EPR integration.
+
+Plain asyncio streams with HTTP/1.1 keep-alive, so it needs nothing beyond the
+standard library. Handlers are microsecond-scale lookups and run inline on the
+event loop; the guideline store is re-checked every few seconds in the
+background so a new DVLA revision is served without a restart.
+
+Endpoints
+  GET  /health
+  GET  /search?q=blackout+at+the+wheel&limit=5&appendix_limit=3
+  POST /lookup  {"condition": "Cough Syncope"}
+  POST /resume  {"event_date": "2026-03-01", "num": 6, "unit": "months"}
+                {"event_date": "2026-03-01", "condition": "Cough Syncope", "group": 2}
+  POST /entry   {"condition": "Cough Syncope", "event_date": "2026-03-01", "num": 6, "unit": "months"}
+
+Condition requests take an optional "chapter", required when the name is
+listed in more than one chapter. Client errors are 400, unknown conditions 404.
+
+Usage: python -m dvla.api [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+from dvla.core import AmbiguousCondition, ConditionNotFound, Core
+
+MAX_HEADER = 16 * 1024
+MAX_BODY = 64 * 1024
+MAX_SEARCH_LIMIT = 50
+MAX_NUM = 1200  # weeks/months/years; keeps resume dates inside the calendar
+REFRESH_SECONDS = 5.0
+UNITS = ("weeks", "months", "years")
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"not JSON serialisable: {type(value).__name__}")
+
+
+# --- PARAMETER PARSING ---
+def _text(params, key, required=True):
+    value = params.get(key)
+    if value in (None, ""):
+        if required:
+            raise HTTPError(400, f"missing '{key}'")
+        return None
+    if not isinstance(value, str):
+        raise HTTPError(400, f"'{key}' must be a string")
+    return value
+
+
+def _date(params, key="event_date", default=None):
+    value = params.get(key)
+    if value in (None, ""):
+        if default is None:
+            raise HTTPError(400, f"missing '{key}'")
+        return default
+    if not isinstance(value, str):
+        raise HTTPError(400, f"'{key}' must be a YYYY-MM-DD string")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPError(400, f"'{key}' must be YYYY-MM-DD") from None
+
+
+def _int(params, key, default=None, low=0, high=None):
+    value = params.get(key, default)
+    # int() would take True as 1 and truncate 6.5 to 6.
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise HTTPError(400, f"'{key}' must be an integer")
+    try:
+        value = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise HTTPError(400, f"'{key}' must be an integer") from None
+    if value < low or (high is not None and value > high):
+        raise HTTPError(400, f"'{key}' out of range")
+    return value
+
+
+def _unit(params):
+    unit = _text(params, "unit").lower()
+    unit = unit if unit.endswith("s") else unit + "s"
+    if unit not in UNITS:
+        raise HTTPError(400, f"'unit' must be one of {', '.join(UNITS)}")
+    return unit
+
+
+def _dated(fn, *args, **kwargs):
+    # Date arithmetic near 9999-12-31 overflows even with a bounded period.
+    try:
+        return fn(*args, **kwargs)
+    except (OverflowError, ValueError) as exc:
+        raise HTTPError(400, f"resume date out of range: {exc}") from None
+
+
+# --- SERVICE ---
+class Service:
+    def __init__(self, core=None):
+        self.core = core or Core()
+        self.routes = {
+            "/health": ("GET", self.health),
+            "/search": ("GET", self.search),
+            "/lookup": ("POST", self.lookup),
+            "/resume": ("POST", self.resume),
+            "/entry": ("POST", self.entry),
+        }
+
+    # Handlers take a params dict and return a JSON-able dict.
+    def health(self, params):
+        g = self.core.guidelines
+        return {"status": "ok", "version": g.version, "digest": g.digest, "error": self.core.store.last_error}
+
+    def search(self, params):
+        hits = self.core.search(
+            _text(params, "q"),
+            _int(params, "limit", 10, 1, MAX_SEARCH_LIMIT),
+            _int(params, "appendix_limit", 3, 0, MAX_SEARCH_LIMIT),
+        )
+        return {"version": self.core.guidelines.version, "hits": [h._asdict() for h in hits]}
+
+    def lookup(self, params):
+        chapter, name, res = self.core.lookup(_text(params, "condition"), _text(params, "chapter", False))
+        return {
+            "version": self.core.guidelines.version, "chapter": chapter, "condition": name,
+            "url": self.core.guidelines.data[chapter]["url"], **res,
+        }
+
+    def resume(self, params):
+        event_date = _date(params)
+        condition = _text(params, "condition", False)
+        if condition:
+            result = _dated(
+                self.core.resume, event_date, condition=condition,
+                group=_int(params, "group", 1, 1, 2), chapter=_text(params, "chapter", False),
+            )
+        else:
+            result = _dated(self.core.resume, event_date, _int(params, "num", high=MAX_NUM), _unit(params))
+        return {"version": self.core.guidelines.version, "event_date": event_date, **result}
+
+    def entry(self, params):
+        text = _dated(
+            self.core.entry, _text(params, "condition"), _int(params, "num", high=MAX_NUM), _unit(params),
+            _date(params, default=date.today()), _text(params, "chapter", False),
+        )
+        return {"version": self.core.guidelines.version, "text": text}
+
+    def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        route = self.routes.get(url.path)
+        try:
+            if route is None:
+                raise HTTPError(404, f"no route {url.path}")
+            if method != route[0]:
+                raise HTTPError(405, f"use {route[0]} for {url.path}")
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if body:
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    raise HTTPError(400, "body must be JSON") from None
+                if not isinstance(payload, dict):
+                    raise HTTPError(400, "body must be a JSON object")
+                params.update(payload)
+            return 200, route[1](params)
+        except HTTPError as exc:
+            return exc.status, {"error": str(exc)}
+        except ConditionNotFound as exc:
+            return 404, {"error": exc.args[0]}
+        except AmbiguousCondition as exc:
+            return 400, {"error": str(exc)}
+
+    # --- HTTP/1.1 ---
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._response(431, {"error": "headers too large"}, False))
+                    break
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    writer.write(self._response(400, {"error": "malformed request line"}, False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    key, _, value = line.partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    writer.write(self._response(413 if length > 0 else 400, {"error": "bad Content-Length"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = self.dispatch(method, target, body)
+                except Exception as exc:  # keep serving other requests
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _refresh_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.core.refresh()
+
+    async def serve(self, host="127.0.0.1", port=8765, refresh=REFRESH_SECONDS, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER, backlog=1024)
+        refresher = asyncio.create_task(self._refresh_loop(refresh))
+        if ready is not None:
+            ready(server.sockets[0].getsockname())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DVLA guideline JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    service = Service()
+    ready = lambda addr: print(f"DVLA API v{service.core.guidelines.version} listening on http://{addr[0]}:{addr[1]}", flush=True)  # noqa: E731
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
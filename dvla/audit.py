@@ -0,0 +1,354 @@
+"""Append-only audit log of generated medical entries.
+
+Entries go to a local SQLite database (WAL mode) through an in-process
+write-behind queue. ``AuditLog.record()`` is what the page's "Record entry"
+button calls: it drops a repeat of the session's previous entry, stamps the time,
+appends the row to a spool file with one unbuffered write and enqueues it.
+A single writer thread drains the queue and inserts in batches, one
+transaction each, when ``batch_size`` rows are waiting or the oldest has
+waited ``flush_interval`` seconds. The table refuses UPDATE and DELETE.
+
+The spool (``audit.sqlite3.spool-*`` next to the database) is what makes
+queued rows survive a hard kill: SIGKILL, the OOM killer or a container stop
+timeout. It is split into segments, and a segment is deleted once every row
+in it is committed. On start, segments left by a dead process are replayed
+into the database, skipping rows already there. The spool is not fsynced, so
+rows recorded in the last few seconds before a power loss or kernel crash can
+still be lost. While the database cannot be written, rows are retried, and
+at most ``max_pending`` are held in memory. Older rows stay in the spool and
+are replayed on the next start.
+
+Usage: python -m dvla.audit [--db data/audit.sqlite3] [--condition TEXT]
+                            [--session ID] [--since 2026-01-01] [--limit 50]
+"""
+import argparse
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process spool locks, so run one server per database
+    fcntl = None
+
+DEFAULT_PATH = Path(os.environ.get("DVLA_AUDIT_DB", Path(__file__).resolve().parents[1] / "data" / "audit.sqlite3"))
+COLUMNS = (
+    "recorded_at", "session", "chapter", "condition", "guideline_version", "guideline_digest",
+    "event_date", "num", "unit", "resume_date", "entry",
+)
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    session TEXT NOT NULL,
+    chapter TEXT NOT NULL,
+    condition TEXT NOT NULL,
+    guideline_version TEXT NOT NULL,
+    guideline_digest TEXT NOT NULL,
+    event_date TEXT NOT NULL,
+    num INTEGER NOT NULL,
+    unit TEXT NOT NULL,
+    resume_date TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_recorded_at ON entries (recorded_at);
+CREATE INDEX IF NOT EXISTS entries_condition ON entries (condition);
+CREATE TRIGGER IF NOT EXISTS entries_no_update BEFORE UPDATE ON entries
+    BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS entries_no_delete BEFORE DELETE ON entries
+    BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+"""
+INSERT = f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+# A replayed row may have been committed just before the crash.
+REPLAY = (
+    f"INSERT INTO entries ({', '.join(COLUMNS)}) SELECT {', '.join('?' * len(COLUMNS))} "
+    "WHERE NOT EXISTS (SELECT 1 FROM entries WHERE recorded_at = ? AND session = ? AND entry = ?)"
+)
+MAX_SESSIONS = 10_000  # sessions remembered for repeat de-duplication
+SPOOL = ".spool-"
+
+_STOP = object()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _lock(fh):
+    """Take the segment's lock; False while the process that wrote it is alive."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def replay(path):
+    """Insert the rows of spool segments left by dead processes; returns the rows inserted."""
+    path = Path(path)
+    inserted = 0
+    for segment in sorted(path.parent.glob(f"{path.name}{SPOOL}*")):
+        with open(segment, "rb") as fh:
+            if not _lock(fh):
+                continue
+            rows = []
+            for line in fh:
+                try:
+                    rows.append(tuple(json.loads(line)))
+                except ValueError:  # a line cut short by the kill
+                    continue
+            conn = _connect(path)
+            try:
+                with conn:
+                    before = conn.total_changes
+                    conn.executemany(REPLAY, [(*row, row[0], row[1], row[-1]) for row in rows])
+                    inserted += conn.total_changes - before
+            finally:
+                conn.close()
+            segment.unlink()
+    return inserted
+
+
+class _Segment:
+    """One spool file, held open and locked until its rows are committed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fh = open(path, "ab", buffering=0)
+        _lock(self.fh)
+        self.rows = 0
+
+    def append(self, line):
+        self.fh.write(line)
+        self.rows += 1
+
+    def discard(self, keep=False):
+        if not keep:
+            self.path.unlink(missing_ok=True)
+        self.fh.close()
+
+
+class AuditLog:
+    def __init__(self, path=DEFAULT_PATH, batch_size=512, flush_interval=1.0, max_pending=100_000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _connect(self.path).close()  # fail fast on a bad path, before the first record
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.last_error = None
+        self.stats = {"queued": 0, "deduplicated": 0, "written": 0, "batches": 0, "replayed": 0, "spooled_only": 0}
+        self.stats["replayed"] = replay(self.path)
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._last = OrderedDict()  # session -> key of its last recorded entry
+        self._closed = False
+        self._segments = 0
+        self._spool = self._new_segment()
+        self._keep_spool = False  # set once rows were dropped from memory; the spool still has them
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _new_segment(self):
+        self._segments += 1
+        name = f"{self.path.name}{SPOOL}{os.getpid()}-{id(self):x}-{self._segments:08d}"
+        return _Segment(self.path.with_name(name))
+
+    # --- RENDER PATH ---
+    def record(self, session, chapter, condition, guidelines, event_date, num, unit, resume_date, entry):
+        """Spool and queue one entry; False when it repeats the session's previous one."""
+        key = (chapter, condition, guidelines.digest, entry)
+        with self._lock:
+            if self._last.get(session) == key:
+                self.stats["deduplicated"] += 1
+                return False
+            self._last[session] = key
+            self._last.move_to_end(session)
+            if len(self._last) > MAX_SESSIONS:
+                self._last.popitem(last=False)
+            self.stats["queued"] += 1
+        row = (
+            datetime.now(timezone.utc).isoformat(timespec="milliseconds"), session, chapter, condition,
+            guidelines.version, guidelines.digest, event_date.isoformat(), int(num), unit,
+            resume_date.isoformat(), entry,
+        )
+        line = json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n"
+        # Spool and enqueue under the lock so a segment's rows reach the queue
+        # before the marker that retires it.
+        with self._lock:
+            if self._spool is not None:
+                try:
+                    self._spool.append(line)
+                except (OSError, ValueError) as exc:
+                    self.last_error = f"spool: {type(exc).__name__}: {exc}"
+            self._queue.put(row)
+        return True
+
+    # --- WRITER THREAD ---
+    def _write(self, conn, batch):
+        try:
+            with conn:
+                conn.executemany(INSERT, batch)
+        except sqlite3.Error as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            return False
+        self.last_error = None
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        return True
+
+    def _rotate(self):
+        # Start a new segment; the old one is retired when its marker comes
+        # off the queue and everything before it is committed.
+        with self._lock:
+            if self._spool is None or not self._spool.rows:
+                return
+            self._queue.put(self._spool)
+            self._spool = self._new_segment()
+
+    def _run(self):
+        conn = _connect(self.path)
+        batch, waiters, retired, deadline = [], [], [], None
+        stopping = False
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, _Segment):
+                retired.append(item)
+            elif item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) > self.max_pending:  # database down: keep the newest rows in memory
+                    del batch[:self.batch_size]
+                    self.stats["spooled_only"] += self.batch_size
+                    self._keep_spool = True
+            # After a failed write, retry once per interval rather than per row or flush().
+            due = stopping or time.monotonic() >= (deadline or 0)
+            if batch and (due or not self.last_error and (waiters or len(batch) >= self.batch_size)):
+                if self._write(conn, batch):
+                    batch = []
+                    self._rotate()
+                else:  # keep the rows and retry after another interval
+                    deadline = time.monotonic() + self.flush_interval
+            if not batch or self.last_error:  # a failing database ends the wait too; last_error says why
+                for event in waiters:
+                    event.set()
+                waiters = []
+            if not batch:
+                for segment in retired:
+                    segment.discard(keep=self._keep_spool)
+                retired = []
+            if stopping:
+                with self._lock:
+                    current, self._spool = self._spool, None
+                while True:  # markers and rows queued behind _STOP
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, _Segment):
+                        retired.append(item)
+                    elif isinstance(item, threading.Event):
+                        item.set()
+                    elif item is not _STOP:
+                        batch.append(item)
+                if batch and self._write(conn, batch):
+                    batch = []
+                for segment in (*retired, current):
+                    segment.discard(keep=bool(batch) or self._keep_spool)
+                conn.close()
+                return
+
+    def flush(self, timeout=None):
+        """Block until everything recorded so far has been written; False if not (see last_error)."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout) and self.last_error is None
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        atexit.unregister(self.close)
+
+    # --- QUERY VIEW ---
+    def query(self, condition=None, session=None, since=None, until=None, limit=200):
+        return query(self.path, condition, session, since, until, limit)
+
+
+def query(path=DEFAULT_PATH, condition=None, session=None, since=None, until=None, limit=200):
+    """Newest-first rows as dicts. ``condition`` matches a substring; dates are inclusive."""
+    where, params = [], []
+    if condition:
+        where.append("condition LIKE ?")
+        params.append(f"%{condition}%")
+    if session:
+        where.append("session = ?")
+        params.append(session)
+    if since:
+        where.append("recorded_at >= ?")
+        params.append(since.isoformat())
+    if until:
+        where.append("recorded_at < date(?, '+1 day')")
+        params.append(until.isoformat())
+    sql = f"SELECT id, {', '.join(COLUMNS)} FROM entries"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id DESC LIMIT ?"
+    if not Path(path).exists():
+        return []
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(sql, (*params, int(limit)))]
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the medical entry audit log")
+    parser.add_argument("--db", default=str(DEFAULT_PATH))
+    parser.add_argument("--condition")
+    parser.add_argument("--session")
+    parser.add_argument("--since", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date())
+    parser.add_argument("--until", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date())
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--full", action="store_true", help="print the full entry text")
+    args = parser.parse_args(argv)
+    rows = query(args.db, args.condition, args.session, args.since, args.until, args.limit)
+    for row in rows:
+        print(f"{row['recorded_at']}  v{row['guideline_version']}  {row['condition']} ({row['chapter']})  "
+              f"event {row['event_date']}, {row['num']} {row['unit']} -> {row['resume_date']}  session {row['session'][:8]}")
+        if args.full:
+            print("    " + row["entry"].replace("\n", "\n    "))
+    print(f"{len(rows)} row(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Vectorised resume dates for whole clinic lists.
+
+Input is a CSV (or DataFrame) with ``event_date``, ``condition`` and ``group``
+columns and an optional ``chapter`` column, needed only for a condition name
+listed in more than one chapter; any other columns (MRN, ward, ...) are
+passed through. Every
+(condition, group) pair is parsed once into a plan row, rows are mapped onto
+the plan with categorical codes, and dates are computed with ``datetime64``
+arithmetic on whole columns. CSV is read and written chunk by chunk.
+
+Usage: python -m dvla.batch events.csv resume_dates.csv
+"""
+import csv
+import io
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from dvla.resume import DATED, NO_RESTRICTION, parse_interval
+
+REQUIRED_COLUMNS = ("event_date", "condition", "group")
+UNKNOWN_CONDITION = "unknown condition"
+AMBIGUOUS_CONDITION = "ambiguous condition (add a chapter column)"
+UNKNOWN_GROUP = "unknown group"
+INVALID_DATE = "invalid date"
+BLOCK_BYTES = 16 << 20  # ~400k rows of a typical audit list per chunk
+DATE_COLUMNS = ("resume_earliest", "resume_latest")
+
+
+class Plan:
+    """Guideline periods for every (condition, group), as flat numpy arrays.
+
+    Row ``2 * condition_code + (group - 1)``; the extra last row is the
+    "unknown" sentinel so a code of -1 needs no special casing.
+    """
+
+    def __init__(self, data):
+        names = pd.Index([name for entry in data.values() for name in entry["conditions"]])
+        # Names are unique within a chapter only: a bare name resolves when it
+        # is unique overall, and (chapter, name) always does.
+        self.keys = pd.Index([_key(chapter, name) for chapter, entry in data.items() for name in entry["conditions"]])
+        duplicated = names.duplicated(keep=False)
+        self.conditions = names[~duplicated]
+        self.positions = np.flatnonzero(~duplicated)
+        self.ambiguous = names[duplicated].unique()
+        guidance, status, months, days = [], [], [], []
+        for entry in data.values():
+            for res in entry["conditions"].values():
+                for text in (res["g1"], res["g2"]):
+                    interval = parse_interval(text)
+                    dated = interval.status == DATED
+                    lo = interval.months_days("low") if dated else (0, 0)
+                    hi = interval.months_days("high") if dated else (0, 0)
+                    guidance.append(text)
+                    status.append(interval.status)
+                    months += [lo[0], hi[0]]
+                    days += [lo[1], hi[1]]
+        guidance.append("")
+        status.append(UNKNOWN_CONDITION)
+        months += [0, 0]
+        days += [0, 0]
+        # Text columns go out as categoricals: codes per row, labels once.
+        self.guidance_codes, self.guidance_labels = pd.factorize(np.array(guidance, dtype=object))
+        self.status_labels = pd.Index(dict.fromkeys(status + [UNKNOWN_GROUP, INVALID_DATE, AMBIGUOUS_CONDITION]))
+        self.status_codes = self.status_labels.get_indexer(status)
+        self.months = np.array(months, dtype=np.int64).reshape(-1, 2)
+        self.days = np.array(days, dtype=np.int64).reshape(-1, 2)
+        self.dated = np.array(status, dtype=object) == DATED
+        self.ranged = self.dated & ((self.months[:, 0] != self.months[:, 1]) | (self.days[:, 0] != self.days[:, 1]))
+        self.undated_ok = np.array(status, dtype=object) == NO_RESTRICTION
+
+    def codes(self, names):
+        """Condition positions for bare names; -1 when unknown or ambiguous."""
+        found = self.conditions.get_indexer(names.str.strip())
+        return np.where(found >= 0, self.positions[found], -1)
+
+
+def _key(chapter, name):
+    return f"{chapter}\x1f{name}"
+
+
+def add_months_days(dates, months, days):
+    """Calendar month arithmetic on datetime64[D] arrays, clamping to month end."""
+    start_month = dates.astype("datetime64[M]")
+    day_of_month = (dates - start_month.astype("datetime64[D]")).astype(np.int64)
+    target = start_month + months.astype("timedelta64[M]")
+    first = target.astype("datetime64[D]")
+    month_len = ((target + np.timedelta64(1, "M")).astype("datetime64[D]") - first).astype(np.int64)
+    return first + np.minimum(day_of_month, month_len - 1).astype("timedelta64[D]") + days.astype("timedelta64[D]")
+
+
+def _per_unique(values, fn):
+    # Audit lists repeat the same few conditions, groups and dates: parse each
+    # distinct value once and broadcast back with the factorized codes.
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return fn(pd.Series(uniques, dtype=object).astype(str))[codes]
+
+
+def parse_dates(values):
+    """ISO (2026-03-01) or UK (01/03/2026) dates to datetime64[D]; NaT when unreadable."""
+    values = pd.Series(values, dtype=object).astype(str).str.strip()
+    parsed = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+    missing = parsed.isna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(values[missing], format="%d/%m/%Y", errors="coerce")
+    return parsed.to_numpy(dtype="datetime64[D]")
+
+
+def parse_groups(values):
+    """'1', 'G2', 'Group 1', 2 -> 0/1 offsets; -1 when unrecognised ('12', 'Group 21')."""
+    digits = pd.Series(values, dtype=object).astype(str).str.extract(r"(?<!\d)([12])\s*$", expand=False)
+    return pd.to_numeric(digits, errors="coerce").fillna(0).to_numpy(dtype=np.int64) - 1
+
+
+def compute(frame, plan):
+    """Append guidance, status and resume_earliest/resume_latest columns to ``frame``."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+
+    cond = _per_unique(frame["condition"], plan.codes)
+    ambiguous = _per_unique(frame["condition"], lambda u: u.str.strip().isin(plan.ambiguous).to_numpy())
+    if "chapter" in frame.columns:
+        chapter = frame["chapter"].fillna("").astype(str).str.strip()
+        keys = chapter + "\x1f" + frame["condition"].fillna("").astype(str).str.strip()
+        by_key = _per_unique(keys, plan.keys.get_indexer)
+        given = (chapter != "").to_numpy()
+        cond = np.where(given, by_key, cond)
+        ambiguous &= ~given
+    group = _per_unique(frame["group"], parse_groups)
+    row = np.where((cond >= 0) & (group >= 0), 2 * cond + group, -1)
+    dates = _per_unique(frame["event_date"], parse_dates)
+
+    status = plan.status_codes[row]
+    status[(cond >= 0) & (group < 0)] = plan.status_labels.get_loc(UNKNOWN_GROUP)
+    status[ambiguous] = plan.status_labels.get_loc(AMBIGUOUS_CONDITION)
+    dated = plan.dated[row]
+    same_day = plan.undated_ok[row]
+    status[np.isnat(dates) & (dated | same_day)] = plan.status_labels.get_loc(INVALID_DATE)
+
+    earliest = add_months_days(dates, plan.months[row, 0], plan.days[row, 0])
+    earliest[~dated] = np.datetime64("NaT")
+    earliest[same_day] = dates[same_day]
+    latest = earliest.copy()
+    ranged = plan.ranged[row]
+    latest[ranged] = add_months_days(dates[ranged], plan.months[row[ranged], 1], plan.days[row[ranged], 1])
+
+    out = frame.copy()
+    out["guidance"] = pd.Categorical.from_codes(plan.guidance_codes[row], plan.guidance_labels)
+    out["status"] = pd.Categorical.from_codes(status, plan.status_labels)
+    out["resume_earliest"] = earliest
+    out["resume_latest"] = latest
+    return out
+
+
+def _header(source):
+    if hasattr(source, "read"):
+        pos = source.tell()
+        line = source.readline()
+        source.seek(pos)
+    else:
+        with open(source, "rb") as fh:
+            line = fh.readline()
+    return next(csv.reader([line.decode("utf-8-sig")]), [])
+
+
+def iter_csv(source, plan, block_size=BLOCK_BYTES):
+    """Yield the result CSV as encoded chunks; ``source`` is a path or binary file.
+
+    Arrow's CSV reader/writer handle the text (pandas' to_csv would dominate
+    the run time); every input column is read as a string so MRNs keep their
+    leading zeros.
+    """
+    names = _header(source)
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in names}, strings_can_be_null=False
+        ),
+    )
+    header = True
+    for batch in reader:
+        table = pa.Table.from_pandas(compute(batch.to_pandas(), plan), preserve_index=False)
+        for name in DATE_COLUMNS:
+            i = table.schema.get_field_index(name)
+            table = table.set_column(i, name, pc.cast(table.column(i), pa.date32()))
+        buf = io.BytesIO()
+        pacsv.write_csv(table, buf, pacsv.WriteOptions(include_header=header))
+        header = False
+        yield buf.getvalue()
+
+
+def main(argv=None):
+    from dvla.store import GuidelineStore
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1], file=sys.stderr)
+        return 2
+    plan = Plan(GuidelineStore().snapshot.data)
+    with open(argv[1], "wb") as out:
+        for chunk in iter_csv(argv[0], plan):
+            out.write(chunk)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
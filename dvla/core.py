@@ -0,0 +1,133 @@
+"""Headless DVLA lookup, resume-date and documentation logic.
+
+Safe to import from an EPR integration or a script: standard library only (no
+Streamlit, numpy or pandas). The search and facet index modules are imported
+on first use, keeping cold import to a few milliseconds.
+"""
+from datetime import date
+
+from dvla.resume import add_period, parse_interval, resume_dates
+from dvla.store import GuidelineStore
+
+
+class ConditionNotFound(KeyError):
+    pass
+
+
+class AmbiguousCondition(LookupError):
+    """A condition name listed in more than one chapter, looked up without one."""
+
+
+def _fmt(d):
+    return d.strftime("%d/%m/%Y")
+
+
+def medical_entry(condition, res, num, unit, event_date, resume_date=None):
+    """The "Proposed Medical Entry" text shown in the app."""
+    resume_date = resume_date or add_period(event_date, num, unit)
+    return (
+        f"DVLA FITNESS TO DRIVE ASSESSMENT:\n"
+        f"Clinical Context: {condition}\n"
+        f"Regulatory Guidance: {res['ref']}\n"
+        f"Advice: Cease driving for {num} {unit.lower()} from {_fmt(event_date)}.\n"
+        f"Earliest Potential Resume: {_fmt(resume_date)}\n"
+        f"DVLA Notification Required: {res['notif']}."
+    )
+
+
+class Core:
+    """Guideline lookups over a hot-reloading ``GuidelineStore`` snapshot."""
+
+    def __init__(self, store=None, appendix=None):
+        self.store = store or GuidelineStore()
+        self.appendix = appendix
+        self._index = None
+        self._index_digest = None
+        self._facets = None
+        self._facets_digest = None
+        self._by_name = {}
+        self._ambiguous = {}
+        self._by_name_digest = None
+
+    @property
+    def guidelines(self):
+        return self.store.snapshot
+
+    def refresh(self):
+        return self.store.refresh()
+
+    def _sync(self):
+        snap = self.store.snapshot
+        if snap.digest != self._by_name_digest:
+            # Names are unique within a chapter only; a name in several
+            # chapters needs the chapter to resolve.
+            self._by_name, self._ambiguous = {}, {}
+            for chapter, entry in snap.data.items():
+                for name, res in entry["conditions"].items():
+                    if name in self._by_name:
+                        self._ambiguous.setdefault(name, [self._by_name[name][0]]).append(chapter)
+                    self._by_name[name] = (chapter, res)
+            self._by_name_digest = snap.digest
+        return snap
+
+    def search(self, query, limit=10, appendix_limit=3):
+        snap = self.store.snapshot
+        if snap.digest != self._index_digest:
+            from dvla.appendix import APPENDIX_D
+            from dvla.search import SearchIndex
+
+            self.appendix = APPENDIX_D if self.appendix is None else self.appendix
+            self._index = SearchIndex.from_data(snap.data, self.appendix)
+            self._index_digest = snap.digest
+        return self._index.search(query, limit, appendix_limit)
+
+    def facets(self):
+        """``dvla.facets.FacetIndex`` for the current guidelines, rebuilt when they change."""
+        snap = self.store.snapshot
+        if snap.digest != self._facets_digest:
+            from dvla.facets import FacetIndex
+
+            self._facets = FacetIndex.from_data(snap.data)
+            self._facets_digest = snap.digest
+        return self._facets
+
+    def lookup(self, condition, chapter=None):
+        """(chapter, condition, res) for an exact condition name.
+
+        Raises ``ConditionNotFound``, or ``AmbiguousCondition`` when the name
+        is in several chapters and ``chapter`` is not given.
+        """
+        snap = self._sync()
+        if chapter is not None:
+            res = snap.data.get(chapter, {}).get("conditions", {}).get(condition)
+            if res is None:
+                raise ConditionNotFound(f"{condition!r} not found in {chapter!r}")
+            return chapter, condition, res
+        if condition in self._ambiguous:
+            raise AmbiguousCondition(
+                f"{condition!r} is listed in {', '.join(map(repr, self._ambiguous[condition]))}; pass chapter"
+            )
+        try:
+            chapter, res = self._by_name[condition]
+        except KeyError:
+            raise ConditionNotFound(f"unknown condition {condition!r}") from None
+        return chapter, condition, res
+
+    def resume(self, event_date, num=None, unit=None, condition=None, group=1, chapter=None):
+        """Resume dates from an explicit period, or from the guideline for ``condition``.
+
+        Returns a dict with ``earliest``/``latest`` dates (None when the
+        guidance has no fixed period) and the ``status`` of the period.
+        """
+        if condition is None:
+            d = add_period(event_date, num, unit)
+            return {"status": "dated", "guidance": f"{num} {unit.lower()}", "earliest": d, "latest": d}
+        _, _, res = self.lookup(condition, chapter)
+        text = res[f"g{group}"]
+        interval = parse_interval(text)
+        earliest, latest = resume_dates(event_date, interval)
+        return {"status": interval.status, "guidance": text, "earliest": earliest, "latest": latest}
+
+    def entry(self, condition, num, unit, event_date=None, chapter=None):
+        _, name, res = self.lookup(condition, chapter)
+        return medical_entry(name, res, num, unit, event_date or date.today())
@@ -0,0 +1,385 @@
+"""Offline ingestion of saved GOV.UK guidance pages into data/guidelines.
+
+Takes a directory of HTML snapshots (pages saved from the browser or with
+``curl -o``) and reads the condition table on each page into the chapter
+schema (``g1``/``g2``/``notif``/``ref``). Table columns are recognised by
+their header text. A page is matched to a chapter by its canonical or
+og:url URL, or else by the chapter file name (``02_cardio...html`` ->
+``02_cardio...json``). Nothing here touches the network.
+
+Pages are parsed in parallel on a process pool. The SHA-256 of each page and
+its extraction are kept in a cache file next to the snapshots, so a page
+whose bytes have not changed is not parsed again. The cache is tagged with
+``PARSER_VERSION`` and ignored after a parser change. Pages that failed to
+parse are not cached. The result is a
+structured diff per chapter (added / removed / renamed / changed fields)
+for review. ``--apply`` writes it through to the chapter files, which the
+running app then hot-reloads.
+
+Usage: python -m dvla.ingest SNAPSHOT_DIR [--guidelines data/guidelines] [--workers 4]
+                            [--json] [--apply [--version 2026.2]]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import NamedTuple
+
+from dvla.store import (
+    CONDITION_FIELDS, DEFAULT_DIR, MANIFEST, GuidelineError, GuidelineStore, compile_chapter, compile_manifest,
+)
+
+CACHE_NAME = ".ingest-cache.json"
+# Bump whenever extraction or the chapter schema changes: cached extractions
+# from another version are discarded and every page is parsed again.
+PARSER_VERSION = 1
+# Header keywords per field, checked in this order; each column maps to one field.
+COLUMNS = (
+    ("g1", ("group 1", "car and motorcycle")),
+    ("g2", ("group 2", "bus and lorry")),
+    ("notif", ("tell dvla", "notify", "notif", "inform dvla")),
+    ("ref", ("notes", "guidance", "reference", "details", "comment")),
+    ("condition", ("condition", "disorder")),
+)
+_SPACE = re.compile(r"\s+")
+
+
+class IngestError(GuidelineError):
+    pass
+
+
+# --- HTML EXTRACTION (runs in worker processes) ---
+class _PageParser(HTMLParser):
+    """Canonical URL, <h1> text and every table as rows of cell text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.url = None
+        self.title = ""
+        self.tables = []
+        self._row = self._cell = None
+        self._in_h1 = False
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "link" and "canonical" in (a.get("rel") or "").split():
+            self.url = a.get("href") or self.url
+        elif tag == "meta" and a.get("property") == "og:url" and not self.url:
+            self.url = a.get("content")
+        elif tag == "h1":
+            self._in_h1 = True
+        elif tag == "table":
+            self.tables.append([])
+        elif tag == "tr" and self.tables:
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "h1":
+            self._in_h1 = False
+        elif tag in ("td", "th") and self._cell is not None:
+            self._row.append(_SPACE.sub(" ", "".join(self._cell)).strip())
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if self._row:
+                self.tables[-1].append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        elif self._in_h1:
+            self.title += data
+
+
+def _columns(header):
+    fields = {}
+    for i, text in enumerate(header):
+        text = text.lower()
+        for field, words in COLUMNS:
+            if field not in fields and any(w in text for w in words):
+                fields[field] = i
+                break
+    return fields
+
+
+def extract(html):
+    """{"url", "title", "conditions": {name: {g1, g2, notif, ref}}} from one page."""
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    conditions = {}
+    found = False
+    for table in parser.tables:
+        if not table:
+            continue
+        cols = _columns(table[0])
+        if not {"condition", "g1", "g2"} <= set(cols):
+            continue
+        found = True
+        missing = [f for f in CONDITION_FIELDS if f not in cols]
+        if missing:
+            raise IngestError(f"condition table has no {', '.join(missing)} column (headers: {table[0]})")
+        for row in table[1:]:
+            if len(row) <= max(cols.values()):
+                continue  # section heading or spanning row
+            name = row[cols["condition"]]
+            if not name:
+                continue
+            if name in conditions:
+                raise IngestError(f"condition {name!r} listed twice")
+            conditions[name] = {f: row[cols[f]] for f in CONDITION_FIELDS}
+    if not found:
+        raise IngestError("no condition table (needs Condition, Group 1 and Group 2 columns)")
+    return {"url": parser.url, "title": _SPACE.sub(" ", parser.title).strip(), "conditions": conditions}
+
+
+def _extract_page(name, raw):
+    try:
+        return name, extract(raw.decode("utf-8", errors="replace")), None
+    except IngestError as exc:
+        return name, None, str(exc)
+
+
+# --- DIFF ---
+class ChapterDiff(NamedTuple):
+    chapter: str
+    file: str        # chapter JSON file, or None for a chapter not in the manifest
+    source: str      # snapshot file name
+    url: str
+    added: dict      # name -> fields
+    removed: dict    # name -> fields
+    renamed: dict    # old name -> new name (fields identical)
+    changed: dict    # name -> {field: [old, new]}
+    unchanged: int
+    conditions: dict  # the page's full extraction
+
+    @property
+    def has_changes(self):
+        return bool(self.added or self.removed or self.renamed or self.changed or self.file is None)
+
+
+def diff_chapter(chapter, file, source, page, current):
+    old, new = current or {}, page["conditions"]
+    added = {n: new[n] for n in new if n not in old}
+    removed = {n: dict(old[n]) for n in old if n not in new}
+    renamed = {}
+    for old_name, fields in list(removed.items()):
+        match = next((n for n, f in added.items() if f == fields), None)
+        if match is not None:
+            renamed[old_name] = match
+            del removed[old_name], added[match]
+    changed = {}
+    for name in (n for n in new if n in old):
+        fields = {f: [old[name][f], new[name][f]] for f in CONDITION_FIELDS if old[name][f] != new[name][f]}
+        if fields:
+            changed[name] = fields
+    unchanged = sum(1 for n in new if n in old) - len(changed)
+    return ChapterDiff(chapter, file, source, page["url"], added, removed, renamed, changed, unchanged, new)
+
+
+class Report(NamedTuple):
+    chapters: list   # ChapterDiff, in manifest order then new chapters
+    parsed: list     # snapshot names parsed this run
+    skipped: list    # snapshot names unchanged since the cached run
+    errors: dict     # snapshot name -> message
+    missing: list    # chapters with no snapshot
+
+    def as_dict(self):
+        return {
+            "chapters": [
+                {k: v for k, v in d._asdict().items() if k != "conditions"} | {"has_changes": d.has_changes}
+                for d in self.chapters
+            ],
+            "parsed": self.parsed, "skipped": self.skipped, "errors": self.errors, "missing": self.missing,
+        }
+
+
+# --- PIPELINE ---
+def _load_cache(path):
+    try:
+        cache = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("parser") != PARSER_VERSION:
+        return {}
+    return cache.get("pages", {})
+
+
+def ingest(snapshot_dir, guidelines_dir=DEFAULT_DIR, workers=None, cache_path=None):
+    snapshot_dir = Path(snapshot_dir)
+    store = GuidelineStore(guidelines_dir)
+    manifest = json.loads((Path(guidelines_dir) / MANIFEST).read_text())
+    data = store.snapshot.data
+    files = dict(zip(data, manifest["chapters"]))  # title -> chapter file
+    by_url = {entry["url"].rstrip("/"): title for title, entry in data.items()}
+    by_stem = {Path(f).stem: title for title, f in files.items()}
+
+    cache_path = Path(cache_path) if cache_path else snapshot_dir / CACHE_NAME
+    cache = _load_cache(cache_path)
+    pages, todo, skipped = {}, [], []
+    for path in sorted(p for p in snapshot_dir.iterdir() if p.suffix.lower() in (".html", ".htm")):
+        raw = path.read_bytes()
+        sha = hashlib.sha256(raw).hexdigest()
+        hit = cache.get(path.name)
+        if hit and hit["sha"] == sha and not hit["error"]:
+            pages[path.name] = hit
+            skipped.append(path.name)
+        else:
+            todo.append((path.name, sha, raw))
+
+    results = []
+    workers = workers or os.cpu_count() or 1
+    if len(todo) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            results = list(pool.map(_extract_page, [n for n, _, _ in todo], [r for _, _, r in todo]))
+    else:
+        results = [_extract_page(n, r) for n, _, r in todo]
+    for (name, sha, _), (_, page, error) in zip(todo, results):
+        pages[name] = {"sha": sha, "page": page, "error": error}
+
+    # Pages no longer present drop out. Failed pages are not cached, so they
+    # are retried next run.
+    good = {name: entry for name, entry in pages.items() if not entry["error"]}
+    cache_path.write_text(json.dumps({"parser": PARSER_VERSION, "pages": good}, indent=1, sort_keys=True))
+
+    diffs, errors, seen = [], {}, set()
+    for name in sorted(pages):
+        entry = pages[name]
+        if entry["error"]:
+            errors[name] = entry["error"]
+            continue
+        page = entry["page"]
+        title = by_url.get((page["url"] or "").rstrip("/")) or by_stem.get(Path(name).stem)
+        if title in seen:
+            errors[name] = f"second snapshot for {title!r}"
+            continue
+        if title is None:
+            title = page["title"] or Path(name).stem
+        seen.add(title)
+        current = data[title]["conditions"] if title in data else None
+        diffs.append(diff_chapter(title, files.get(title), name, page, current))
+    order = {title: i for i, title in enumerate(data)}
+    diffs.sort(key=lambda d: order.get(d.chapter, len(order)))
+    missing = [title for title in data if title not in seen]
+    return Report(diffs, [n for n, _, _ in todo], skipped, errors, missing)
+
+
+# --- APPLY ---
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")[:40]
+
+
+def _write_json(path, value):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(value, indent=2, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+
+
+def apply(report, guidelines_dir=DEFAULT_DIR, version=None):
+    """Write changed chapters (and new ones) to the chapter files; returns the files written.
+
+    Every chapter and the new manifest are built and validated before the
+    first write, so a bad page leaves the directory untouched. The manifest
+    goes last. Each file is replaced atomically, but the set is not: a
+    refresh during the writes can briefly see new chapters under the old
+    manifest version.
+    """
+    guidelines_dir = Path(guidelines_dir)
+    manifest = json.loads((guidelines_dir / MANIFEST).read_text())
+    chapters = list(manifest["chapters"])
+    titles = {json.loads((guidelines_dir / f).read_text())["title"]: f for f in chapters}
+    planned = []
+    for d in report.chapters:
+        if not d.has_changes:
+            continue
+        file = d.file or f"{len(chapters) + 1:02d}_{_slug(d.chapter)}.json"
+        path = guidelines_dir / file
+        if d.file:
+            current = json.loads(path.read_text())
+        else:
+            if path.exists():
+                raise IngestError(f"{file}: already exists but is not in {MANIFEST}")
+            if d.chapter in titles:
+                raise IngestError(f"{d.source}: chapter {d.chapter!r} is already {titles[d.chapter]}")
+            current = {"title": d.chapter, "url": d.url}
+            chapters.append(file)
+            titles[d.chapter] = file
+        chapter = {"title": current["title"], "url": current["url"] or d.url, "conditions": d.conditions}
+        compile_chapter(chapter, file)
+        planned.append((path, chapter))
+    if not planned and not version:
+        return []
+    manifest = {**manifest, "chapters": chapters, **({"version": version} if version else {})}
+    compile_manifest(manifest)
+    for path, chapter in planned:
+        _write_json(path, chapter)
+    _write_json(guidelines_dir / MANIFEST, manifest)
+    return [path.name for path, _ in planned]
+
+
+# --- REPORT ---
+def format_report(report):
+    lines = []
+    for d in report.chapters:
+        status = "new chapter" if d.file is None else "changed" if d.has_changes else "no changes"
+        lines.append(f"{d.chapter}  [{d.source}: {status}]")
+        for old, new in d.renamed.items():
+            lines.append(f"  > {old}  ->  {new}")
+        for name, fields in d.changed.items():
+            lines.append(f"  ~ {name}")
+            lines += [f"      {f}: {old!r} -> {new!r}" for f, (old, new) in fields.items()]
+        for name, res in d.added.items():
+            lines.append(f"  + {name}: " + ", ".join(f"{f} {res[f]!r}" for f in CONDITION_FIELDS))
+        for name in d.removed:
+            lines.append(f"  - {name}")
+        lines.append(f"  = {d.unchanged} unchanged")
+    for name, error in report.errors.items():
+        lines.append(f"ERROR {name}: {error}")
+    changed = [d for d in report.chapters if d.has_changes]
+    lines.append(
+        f"{len(report.parsed) + len(report.skipped)} page(s): {len(report.parsed)} parsed, "
+        f"{len(report.skipped)} unchanged since last run; {len(changed)} chapter(s) with changes "
+        f"(+{sum(len(d.added) for d in changed)} -{sum(len(d.removed) for d in changed)} "
+        f"~{sum(len(d.changed) for d in changed)} >{sum(len(d.renamed) for d in changed)})"
+    )
+    if report.missing:
+        lines.append("no snapshot for: " + "; ".join(report.missing))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff saved GOV.UK chapter pages against data/guidelines")
+    parser.add_argument("snapshots", help="directory of saved .html pages")
+    parser.add_argument("--guidelines", default=str(DEFAULT_DIR))
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache", help=f"hash cache file (default: SNAPSHOTS/{CACHE_NAME})")
+    parser.add_argument("--json", action="store_true", help="print the diff as JSON")
+    parser.add_argument("--apply", action="store_true", help="write changed chapters to the guideline files")
+    parser.add_argument("--version", help="with --apply: new manifest version")
+    args = parser.parse_args(argv)
+
+    try:
+        report = ingest(args.snapshots, args.guidelines, args.workers, args.cache)
+    except (OSError, GuidelineError) as exc:
+        parser.exit(2, f"error: {exc}\n")
+    print(json.dumps(report.as_dict(), indent=1) if args.json else format_report(report))
+    if args.apply:
+        try:
+            written = apply(report, args.guidelines, args.version)
+        except (OSError, GuidelineError) as exc:
+            parser.exit(2, f"error: {exc}\n")
+        print(f"wrote {', '.join(written) or 'no chapter files'}", file=sys.stderr if args.json else sys.stdout)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
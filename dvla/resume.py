@@ -0,0 +1,72 @@
+"""Cessation periods and calendar-correct resume dates.
+
+Guideline text such as "6 months off." or "1-3 years stability." is parsed
+once into an ``Interval``; months and years are added on the calendar (day
+clamped to the end of the target month) rather than as 30.44-day blocks.
+"""
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+# Status of a parsed guideline period
+DATED = "dated"            # fixed period: resume date can be computed
+NO_RESTRICTION = "none"    # may drive: resume date is the event date
+INDEFINITE = "indefinite"  # revoked / stop until treated: no date
+REVIEW = "review"          # depends on DVLA / specialist review: no date
+
+_PERIOD = re.compile(r"(\d+)(?:\s*-\s*(\d+))?\s*(week|month|year)s?\b")
+_NO_RESTRICTION = ("no restriction", "no notification", "no (usually)", "clinical pass")
+_INDEFINITE = ("revoked", "permanent", "stop")
+_UNIT_MONTHS = {"month": 1, "year": 12}
+
+
+class Interval(NamedTuple):
+    status: str
+    low: int = 0    # period length in `unit`, earliest resume
+    high: int = 0   # period length in `unit`, latest resume (== low unless a range)
+    unit: str = "week"
+
+    def months_days(self, bound="low"):
+        n = getattr(self, bound)
+        return (n * _UNIT_MONTHS[self.unit], 0) if self.unit in _UNIT_MONTHS else (0, n * 7)
+
+
+@lru_cache(maxsize=1024)
+def parse_interval(text):
+    t = text.lower()
+    m = _PERIOD.search(t)
+    if m:
+        low = int(m.group(1))
+        high = int(m.group(2) or low)
+        return Interval(DATED, low, max(low, high), m.group(3))
+    if t.startswith(_NO_RESTRICTION):
+        return Interval(NO_RESTRICTION)
+    if any(word in t for word in _INDEFINITE):
+        return Interval(INDEFINITE)
+    return Interval(REVIEW)
+
+
+def add_months(d, months):
+    y, m = divmod(d.month - 1 + months, 12)
+    year, month = d.year + y, m + 1
+    next_first = date(year + month // 12, month % 12 + 1, 1)
+    return date(year, month, min(d.day, (next_first - timedelta(days=1)).day))
+
+
+def add_period(d, num, unit):
+    """Add ``num`` weeks/months/years to ``d``; unit is singular or plural, any case."""
+    unit = unit.lower().rstrip("s")
+    if unit in _UNIT_MONTHS:
+        return add_months(d, num * _UNIT_MONTHS[unit])
+    return d + timedelta(weeks=num)
+
+
+def resume_dates(event_date, interval):
+    """(earliest, latest) resume dates for an Interval, or (None, None) if undated."""
+    if interval.status == NO_RESTRICTION:
+        return event_date, event_date
+    if interval.status != DATED:
+        return None, None
+    return (add_period(event_date, interval.low, interval.unit),
+            add_period(event_date, interval.high, interval.unit))
@@ -0,0 +1,261 @@
+"""Free-text search over DVLA conditions and Appendix D.
+
+The index is built once (inverted index + trigram index over the vocabulary)
+and then answers queries with a handful of dict lookups. Results are memoised
+per query string, so Streamlit reruns with an unchanged search box are free.
+"""
+import bisect
+import heapq
+import itertools
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import NamedTuple
+
+# --- TEXT NORMALISATION ---
+_TAGS = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Multi-word clinical phrases collapsed to a single canonical token, applied to
+# documents and queries alike.
+PHRASES = [
+    (re.compile(r"\b(?:transient )?loss of consciousness\b"), "tloc"),
+    (re.compile(r"\b(?:obstructive )?sleep apn(?:o)?ea\b"), "osa"),
+    (re.compile(r"\bpass(?:ed|ing) out\b"), "blackout"),
+    (re.compile(r"\bheart attack\b"), "acs"),
+    (re.compile(r"\b(?:at|behind) the wheel\b|\bsteering wheel\b"), "driving"),
+    (re.compile(r"\bheart failure\b"), "hf"),
+]
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has if in is it of on or the to was with".split()
+)
+
+# Terms in a group expand to each other; a term in several groups reaches the
+# union. A blackout or collapse is any TLoC, while a faint is syncope, so the
+# two only meet through "tloc" <-> "syncope".
+SYNONYM_GROUPS = [
+    ("tloc", "blackout", "collapse", "unconscious"),
+    ("syncope", "faint", "fainting"),
+    ("tloc", "syncope"),
+    ("osa", "apnoea", "apnea", "cpap", "snoring"),
+    ("hypo", "hypoglycaemia", "hypoglycemia"),
+    ("seizure", "fit", "convulsion", "epilepsy"),
+    ("stroke", "tia", "cva"),
+    ("acs", "mi", "pci", "stemi", "nstemi"),
+    ("icd", "defibrillator"),
+    ("pacemaker", "ppm"),
+    ("twice", "x2", "multiple", "recurrent", "repeated"),
+    ("alcohol", "etoh", "drink"),
+    ("dementia", "cognitive", "alzheimer"),
+    ("subarachnoid", "sah"),
+    ("driving", "driver", "drive"),
+    ("hf", "nyha"),
+]
+SYNONYMS = {}
+for _group in SYNONYM_GROUPS:
+    for _term in _group:
+        SYNONYMS.setdefault(_term, set()).update(t for t in _group if t != _term)
+
+SYNONYM_WEIGHT = 0.8
+PREFIX_WEIGHT = 0.9
+FUZZY_WEIGHT = 0.8
+FUZZY_MIN_SIMILARITY = 0.3
+MAX_PREFIX_TERMS = 5
+# Postings hold the Appendix D sections, then conditions best-first. For a
+# synonym/prefix/fuzzy expansion, or a term in more than COMMON_FRACTION of the
+# docs (a word in a big chapter name: "syncope", "tloc"), a query scans the
+# sections and only the best MAX_POSTINGS conditions; the tail skipped is
+# conditions that match it only through a low-weight field. The query's own
+# rarer terms are scanned in full so AND-like queries ("meningioma surgery")
+# still meet.
+COMMON_FRACTION = 0.1
+MAX_POSTINGS = 200
+
+# --- FIELD WEIGHTS ---
+TITLE_WEIGHT = 3.0
+GUIDANCE_WEIGHT = 1.0
+CHAPTER_WEIGHT = 0.5
+APPENDIX_TITLE_WEIGHT = 2.0
+APPENDIX_BODY_WEIGHT = 0.6
+# Every guidance line is about driving ("Stop driving.", "Must not drive if
+# ..."), so in g1/g2/ref these words say nothing about the presentation; a
+# "... at the wheel" query should rank by what happened, not by the sanction.
+GUIDANCE_STOPWORDS = frozenset({"driving", "driver", "drive"})
+
+
+def _stem(word):
+    if len(word) > 4 and word.endswith("s") and not word.endswith(("ss", "is", "us")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text, stopwords=STOPWORDS):
+    text = _TAGS.sub(" ", text.lower())
+    for pattern, token in PHRASES:
+        text = pattern.sub(f" {token} ", text)
+    return [_stem(w) for w in _WORD.findall(text) if w not in stopwords]
+
+
+def _trigrams(term):
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _by_score(item):
+    return item[1]
+
+
+class Hit(NamedTuple):
+    score: float
+    kind: str  # "condition" or "appendix"
+    chapter: str
+    title: str
+
+
+class SearchIndex:
+    def __init__(self, docs, cache_size=256):
+        # docs: iterable of (kind, chapter, title, [(text, weight[, extra stopwords]), ...])
+        self.docs = []
+        raw = defaultdict(dict)
+        for doc_id, (kind, chapter, title, fields) in enumerate(docs):
+            self.docs.append((kind, chapter, title))
+            weights = defaultdict(float)
+            for text, weight, *extra in fields:
+                for token in tokenize(text, STOPWORDS.union(*extra)):
+                    weights[token] += weight
+            for token, w in weights.items():
+                raw[token][doc_id] = 1.0 + math.log(w) if w > 1.0 else w
+
+        n = max(len(self.docs), 1)
+        self.postings = {}
+        for token, docs_w in raw.items():
+            idf = math.log(1.0 + n / len(docs_w))
+            ranked = sorted(docs_w.items(), key=lambda dw: (self.docs[dw[0]][0] != "appendix", -dw[1]))
+            self.postings[token] = tuple((d, w * idf) for d, w in ranked)
+
+        # Fuzzy layer covers the indexed vocabulary plus synonym heads, so a
+        # misspelt "blakout" still reaches "blackout" -> "tloc".
+        self._terms = sorted(set(self.postings) | set(SYNONYMS))
+        self._grams = [_trigrams(t) for t in self._terms]
+        self._by_gram = defaultdict(list)
+        for term_id, grams in enumerate(self._grams):
+            for g in grams:
+                self._by_gram[g].append(term_id)
+
+        self._sections = [d for d, doc in enumerate(self.docs) if doc[0] == "appendix"]
+        self._common = COMMON_FRACTION * n
+        self._scan = MAX_POSTINGS + len(self._sections)
+        self._expansions = {}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()  # index is shared across sessions
+
+    @classmethod
+    def from_data(cls, data, appendix=()):
+        docs = []
+        for chapter, entry in data.items():
+            for name, res in entry["conditions"].items():
+                docs.append(("condition", chapter, name, [
+                    (name, TITLE_WEIGHT),
+                    (res["ref"], GUIDANCE_WEIGHT, GUIDANCE_STOPWORDS),
+                    (res["g1"], GUIDANCE_WEIGHT, GUIDANCE_STOPWORDS),
+                    (res["g2"], GUIDANCE_WEIGHT, GUIDANCE_STOPWORDS),
+                    (chapter, CHAPTER_WEIGHT),
+                ]))
+        for title, body in appendix:
+            docs.append(("appendix", "Appendix D", title, [
+                (title, APPENDIX_TITLE_WEIGHT),
+                (body, APPENDIX_BODY_WEIGHT),
+            ]))
+        return cls(docs)
+
+    # --- QUERY EXPANSION ---
+    def _fuzzy(self, token):
+        grams = _trigrams(token)
+        shared = defaultdict(int)
+        for g in grams:
+            for term_id in self._by_gram.get(g, ()):
+                shared[term_id] += 1
+        scored = []
+        for term_id, k in shared.items():
+            sim = k / (len(grams) + len(self._grams[term_id]) - k)
+            if sim >= FUZZY_MIN_SIMILARITY:
+                scored.append((sim, self._terms[term_id]))
+        scored.sort(reverse=True)
+        return {term: sim * FUZZY_WEIGHT for sim, term in scored[:3]}
+
+    def _expand(self, token):
+        cached = self._expansions.get(token)
+        if cached is not None:
+            return cached
+        if token in self.postings or token in SYNONYMS:
+            seeds = {token: 1.0}
+        else:
+            seeds = self._fuzzy(token)
+        out = {}
+        for term, w in seeds.items():
+            if term in self.postings:
+                out[term] = max(out.get(term, 0.0), w)
+            for syn in SYNONYMS.get(term, ()):
+                if syn in self.postings:
+                    out[syn] = max(out.get(syn, 0.0), w * SYNONYM_WEIGHT)
+        if len(token) >= 3:
+            i, found = bisect.bisect_right(self._terms, token), 0
+            while i < len(self._terms) and self._terms[i].startswith(token) and found < MAX_PREFIX_TERMS:
+                term = self._terms[i]
+                if term in self.postings:
+                    out[term] = max(out.get(term, 0.0), PREFIX_WEIGHT)
+                    found += 1
+                i += 1
+        if len(self._expansions) > 16 * self._cache_size:
+            self._expansions.clear()
+        self._expansions[token] = out
+        return out
+
+    # --- SEARCH ---
+    def search(self, query, limit=10, appendix_limit=3):
+        # Conditions and Appendix D sections are ranked separately, so a query
+        # that matches most of the appendix cannot push the conditions out.
+        key = (query.strip().lower(), limit, appendix_limit)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        tokens = list(dict.fromkeys(tokenize(key[0])))
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for token in tokens:
+            best = {}
+            for term, weight in self._expand(token).items():
+                postings = self.postings[term]
+                if term != token or len(postings) > self._common:
+                    postings = itertools.islice(postings, self._scan)
+                if not best:
+                    best = {doc_id: w * weight for doc_id, w in postings}
+                    continue
+                for doc_id, w in postings:
+                    s = w * weight
+                    if s > best.get(doc_id, 0.0):
+                        best[doc_id] = s
+            for doc_id, s in best.items():
+                scores[doc_id] += s
+                matched[doc_id] += 1
+
+        n = len(tokens) or 1
+        final = {d: s * matched[d] / n for d, s in scores.items()}
+        sections = {d: final.pop(d) for d in self._sections if d in final}
+        ranked = sorted(
+            heapq.nlargest(limit, final.items(), key=_by_score)
+            + heapq.nlargest(appendix_limit, sections.items(), key=_by_score),
+            key=_by_score, reverse=True,
+        )
+        hits = [Hit(round(s, 4), *self.docs[d]) for d, s in ranked]
+
+        with self._lock:
+            self._cache[key] = hits
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return hits
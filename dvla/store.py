@@ -0,0 +1,135 @@
+"""Versioned guideline data store.
+
+Guidelines live in ``data/guidelines``: a ``manifest.json`` naming the version
+and the chapter files in display order, plus one JSON file per chapter. Each
+chapter is validated and compiled into read-only mappings with the same shape
+as the old ``DVLA_DATA`` literal (``data[chapter]["conditions"][name]["g1"]``).
+
+``GuidelineStore.refresh()`` is cheap enough to call on every rerun: it stats
+the files, re-hashes only those whose mtime/size moved, and re-parses only
+chapters whose content hash actually changed.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+DEFAULT_DIR = Path(__file__).resolve().parents[1] / "data" / "guidelines"
+MANIFEST = "manifest.json"
+CONDITION_FIELDS = ("g1", "g2", "notif", "ref")
+
+
+class GuidelineError(ValueError):
+    pass
+
+
+class Guidelines(NamedTuple):
+    version: str
+    digest: str  # changes whenever any chapter or the manifest changes
+    data: Mapping
+
+
+class _FileState(NamedTuple):
+    stamp: tuple  # (mtime_ns, size)
+    sha: str
+    value: object
+
+
+# --- VALIDATION & COMPILATION ---
+def _require(cond, where, msg):
+    if not cond:
+        raise GuidelineError(f"{where}: {msg}")
+
+
+def compile_manifest(raw, where=MANIFEST):
+    _require(isinstance(raw, dict), where, "manifest must be an object")
+    _require(isinstance(raw.get("version"), str) and raw["version"], where, "missing 'version'")
+    chapters = raw.get("chapters")
+    _require(isinstance(chapters, list) and chapters, where, "'chapters' must be a non-empty list")
+    _require(all(isinstance(c, str) for c in chapters), where, "chapter entries must be file names")
+    _require(len(set(chapters)) == len(chapters), where, "duplicate chapter file")
+    return MappingProxyType({"version": raw["version"], "chapters": tuple(chapters)})
+
+
+def compile_chapter(raw, where):
+    _require(isinstance(raw, dict), where, "chapter must be an object")
+    for key in ("title", "url"):
+        _require(isinstance(raw.get(key), str) and raw[key].strip(), where, f"missing '{key}'")
+    _require(raw["url"].startswith("https://"), where, "'url' must be https")
+    conditions = raw.get("conditions")
+    _require(isinstance(conditions, dict) and conditions, where, "'conditions' must be a non-empty object")
+    compiled = {}
+    for name, res in conditions.items():
+        cwhere = f"{where} [{name}]"
+        _require(isinstance(res, dict), cwhere, "condition must be an object")
+        missing = [f for f in CONDITION_FIELDS if not isinstance(res.get(f), str) or not res[f].strip()]
+        _require(not missing, cwhere, f"missing {', '.join(missing)}")
+        extra = set(res) - set(CONDITION_FIELDS)
+        _require(not extra, cwhere, f"unknown fields {', '.join(sorted(extra))}")
+        compiled[name] = MappingProxyType({f: res[f] for f in CONDITION_FIELDS})
+    return raw["title"], MappingProxyType({"url": raw["url"], "conditions": MappingProxyType(compiled)})
+
+
+# --- STORE ---
+class GuidelineStore:
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = Path(directory)
+        self.last_error = None
+        self.stats = {"parsed": 0, "hashed": 0}
+        self._files = {}
+        self._lock = threading.Lock()
+        self.snapshot = None
+        self.refresh(strict=True)
+
+    def _load(self, name, compile_fn):
+        path = self.directory / name
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        prev = self._files.get(name)
+        if prev is not None and prev.stamp == stamp:
+            return prev.value
+        raw = path.read_bytes()
+        sha = hashlib.sha256(raw).hexdigest()
+        self.stats["hashed"] += 1
+        if prev is not None and prev.sha == sha:
+            self._files[name] = prev._replace(stamp=stamp)
+            return prev.value
+        try:
+            value = compile_fn(json.loads(raw), name)
+        except json.JSONDecodeError as exc:
+            raise GuidelineError(f"{name}: invalid JSON ({exc})") from None
+        self.stats["parsed"] += 1
+        self._files[name] = _FileState(stamp, sha, value)
+        return value
+
+    def refresh(self, strict=False):
+        """Pick up changed files. Returns True if a new snapshot was published.
+
+        On a bad revision the previous snapshot keeps serving and the problem
+        is reported through ``last_error`` (or raised when ``strict``).
+        """
+        with self._lock:
+            try:
+                manifest = self._load(MANIFEST, compile_manifest)
+                chapters = {}
+                for name in manifest["chapters"]:
+                    title, chapter = self._load(name, compile_chapter)
+                    _require(title not in chapters, name, f"duplicate chapter title {title!r}")
+                    chapters[title] = chapter
+            except (OSError, GuidelineError) as exc:
+                if strict or self.snapshot is None:
+                    raise
+                self.last_error = str(exc)
+                return False
+
+            self.last_error = None
+            names = (MANIFEST, *manifest["chapters"])
+            digest = hashlib.sha256("".join(self._files[n].sha for n in names).encode()).hexdigest()[:16]
+            if self.snapshot is not None and digest == self.snapshot.digest:
+                return False
+            for name in set(self._files) - set(names):
+                del self._files[name]
+            self.snapshot = Guidelines(manifest["version"], digest, MappingProxyType(chapters))
+            return True
@@ -0,0 +1,151 @@
+"""Appendix D (sections 3-6) TLoC / syncope decision engine.
+
+The published tables are written once as plain rules in ``_rule``. At import
+the rules are evaluated for every combination of answers and frozen into
+``DECISION_TABLE``, so ``decide()`` is a single dict lookup. Periods reuse
+``dvla.resume.Interval`` so resume dates come from the same calendar maths
+as the rest of the app.
+"""
+from itertools import product
+from types import MappingProxyType
+from typing import NamedTuple
+
+from dvla.resume import DATED, NO_RESTRICTION, REVIEW, Interval, resume_dates
+
+PATHWAYS = MappingProxyType({
+    "reflex_prodrome": "Reflex syncope with a reliable prodrome",
+    "reflex_no_prodrome": "Reflex syncope without a reliable prodrome",
+    "unexplained": "Unexplained loss of consciousness",
+    "seizure_markers": "Blackout with seizure markers",
+    "cough": "Cough syncope",
+})
+SECTIONS = MappingProxyType({
+    "reflex_prodrome": " 3. Reflex Syncope Standards (With & Without Prodrome)",
+    "reflex_no_prodrome": " 3. Reflex Syncope Standards (With & Without Prodrome)",
+    "unexplained": " 4. Unexplained Loss of Consciousness",
+    "seizure_markers": " 5. Blackouts with Seizure Markers",
+    "cough": " 6. Cough Syncope Standards",
+})
+GROUPS = (1, 2)
+
+
+class Answers(NamedTuple):
+    pathway: str
+    group: int
+    multiple: bool = False       # 2+ episodes (24 months for reflex; >24h apart for cough)
+    provoked: bool = False       # associated with an avoidable provocation
+    while_driving: bool = False  # an episode occurred while driving
+    high_risk: bool = False      # seizure markers: high risk of recurrence
+
+
+class Decision(NamedTuple):
+    interval: Interval
+    notify: bool
+    subject_to_report: bool
+    summary: str
+
+    @property
+    def cessation(self):
+        iv = self.interval
+        if iv.status == NO_RESTRICTION:
+            return "None"
+        if iv.status == DATED:
+            return f"{iv.low} {iv.unit}{'s' if iv.low != 1 else ''}"
+        return "Other standard applies"
+
+    def resume(self, event_date):
+        """(earliest, latest) resume dates; (None, None) when no fixed period applies."""
+        return resume_dates(event_date, self.interval)
+
+
+def _off(n, unit, notify, summary, report=False):
+    return Decision(Interval(DATED, n, n, unit), notify, report, summary)
+
+
+def _drive(notify, summary):
+    return Decision(Interval(NO_RESTRICTION), notify, False, summary)
+
+
+# --- PUBLISHED RULES ---
+def _rule(a):
+    safe = a.provoked and not a.while_driving
+
+    if a.pathway == "reflex_prodrome":
+        if a.group == 1:
+            if not a.while_driving:
+                return _drive(False, "May drive; need not notify DVLA.")
+            if a.multiple:
+                return _off(3, "month", True, "Must not drive; must notify DVLA. Resume 3 months after most recent episode.")
+            return _off(1, "month", False, "Must not drive; need not notify DVLA. Resume 1 month after the episode.")
+        if a.multiple:
+            if safe:
+                return _drive(True, "Must notify DVLA. May resume driving after recovery.")
+            return _off(6, "month", True, "Must notify DVLA and must not drive. Resume 6 months after, subject to specialist report.", True)
+        if safe:
+            return _drive(True, "Must notify DVLA. May resume driving after recovery.")
+        return _off(3, "month", True, "Must notify DVLA; must not drive. Resume 3 months after, subject to specialist report.", True)
+
+    if a.pathway == "reflex_no_prodrome":
+        if a.group == 1:
+            if a.multiple:
+                if safe:
+                    return _off(3, "month", True, "Must not drive; must notify DVLA. Resume after 3 months.")
+                return _off(6, "month", True, "Must not drive; must notify DVLA. Resume after 6 months.")
+            if safe:
+                return _drive(True, "Must not drive; must notify DVLA. Resume after recovery.")
+            return _off(3, "month", True, "Must not drive; must notify DVLA. Resume after 3 months.")
+        if a.multiple:
+            return _off(12, "month", True, "Must not drive; must notify DVLA. Relicensing may be considered after 12 months, subject to specialist report.", True)
+        if safe:
+            return _off(3, "month", True, "Must not drive; must notify DVLA. Resume after 3 months, subject to specialist report.", True)
+        return _off(12, "month", True, "Must not drive; must notify DVLA. Resume after 12 months, subject to specialist report.", True)
+
+    if a.pathway == "unexplained":
+        if a.group == 1:
+            if a.multiple:
+                return _off(12, "month", True, "Must notify DVLA. Licence revoked for 12 months after most recent episode.")
+            return _off(6, "month", True, "Must notify DVLA. Resume 6 months after the episode.")
+        if a.multiple:
+            return _off(5, "year", True, "Must notify DVLA. Licence revoked for 5 years after most recent episode.")
+        return _off(12, "month", True, "Must notify DVLA. Licence revoked for 12 months.")
+
+    if a.pathway == "seizure_markers":
+        if a.multiple:
+            return Decision(Interval(REVIEW), True, False, "Stop driving; notify DVLA. Standards for isolated seizure or epilepsy apply (Chapter 1).")
+        if a.group == 2:
+            return _off(5, "year", True, "Stop driving; notify DVLA. 5 years off.")
+        if a.high_risk:
+            return _off(12, "month", True, "Stop driving; notify DVLA. 12 months off (high risk).")
+        return _off(6, "month", True, "Stop driving; notify DVLA. 6 months off.")
+
+    if a.pathway == "cough":
+        if a.group == 1:
+            if a.multiple:
+                return _off(12, "month", True, "Must notify DVLA. 12 months off (multiple episodes).")
+            return _off(6, "month", True, "Must notify DVLA. 6 months off (single episode).")
+        if a.multiple:
+            return _off(5, "year", True, "Must notify DVLA. 5 years off (multiple episodes).")
+        return _off(12, "month", True, "Must notify DVLA. 12 months off (single episode).")
+
+    raise ValueError(f"unknown pathway {a.pathway!r}")
+
+
+def all_answers():
+    flags = (False, True)
+    for combo in product(PATHWAYS, GROUPS, flags, flags, flags, flags):
+        yield Answers(*combo)
+
+
+def compile_table():
+    return MappingProxyType({a: _rule(a) for a in all_answers()})
+
+
+DECISION_TABLE = compile_table()
+
+
+def decide(pathway, group, multiple=False, provoked=False, while_driving=False, high_risk=False):
+    key = Answers(pathway, int(group), bool(multiple), bool(provoked), bool(while_driving), bool(high_risk))
+    try:
+        return DECISION_TABLE[key]
+    except KeyError:
+        raise ValueError(f"no Appendix D rule for {key}") from None
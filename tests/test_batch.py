@@ -0,0 +1,6 @@
+from dvla.batch import parse_groups
+
+
+def test_parse_groups():
+    values = ["1", "G2", "Group 1", 2, " 2 ", "12", "Group 12", "21", "3", "", None]
+    assert parse_groups(values).tolist() == [0, 1, 0, 1, 1, -1, -1, -1, -1, -1, -1]
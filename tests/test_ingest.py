@@ -0,0 +1,119 @@
+"""Offline ingestion against the saved GOV.UK fixture pages.
+
+The fixtures in tests/fixtures/govuk are made-up snapshots, not real guidance:
+- a cardiovascular page with one rename, two changed fields, one addition and
+  one removal;
+- a diabetes page matched by og:url that agrees with the current data;
+- a hearing page that is a new chapter;
+- a saved error page that has no condition table.
+Sockets are patched to fail for every test. The pool forks after the patch,
+so the worker processes inherit it.
+"""
+import shutil
+import socket
+from pathlib import Path
+
+import pytest
+
+import dvla.ingest
+from dvla.ingest import apply, ingest
+from dvla.store import DEFAULT_DIR, GuidelineError, GuidelineStore
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "govuk"
+CARDIO = "Chapter 2: Cardiovascular & Syncope/TLoC"
+DIABETES = "Chapter 3: Diabetes"
+HEARING = "Hearing: assessing fitness to drive"
+PAGES = ["02_cardiovascular.html", "03_diabetes.html", "08_miscellaneous.html", "hearing.html"]
+FAILING = ["08_miscellaneous.html"]  # not cached, so parsed on every run
+GOOD = [p for p in PAGES if p not in FAILING]
+WORKERS = 2
+
+
+def no_network(*args, **kwargs):
+    raise OSError("network access during offline ingestion")
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(socket.socket, "connect", no_network)
+    monkeypatch.setattr(socket, "create_connection", no_network)
+    snapshots, guidelines = tmp_path / "snapshots", tmp_path / "guidelines"
+    shutil.copytree(FIXTURES, snapshots)
+    shutil.copytree(DEFAULT_DIR, guidelines)
+    return snapshots, guidelines
+
+
+@pytest.fixture
+def first(dirs):
+    return ingest(*dirs, workers=WORKERS)
+
+
+def chapter(report, title):
+    return next(d for d in report.chapters if d.chapter == title)
+
+
+def test_first_run_parses_every_page(first):
+    assert first.parsed == PAGES and not first.skipped
+    assert [d.chapter for d in first.chapters] == [CARDIO, DIABETES, HEARING]
+
+
+def test_cardiovascular_diff(first):
+    cardio = chapter(first, CARDIO)
+    assert cardio.renamed == {"ACS (PCI performed)": "Acute coronary syndrome (PCI performed)"}
+    assert list(cardio.removed) == ["Brugada Syndrome"]
+    assert cardio.added == {"Long QT Syndrome": {
+        "g1": "No restriction.", "g2": "Notify/Review.", "notif": "G2 Yes",
+        "ref": "G2 requires specialist assessment & report."}}
+    assert sorted(cardio.changed) == ["Cough Syncope", "Pacemaker Insertion"]
+    assert cardio.changed["Pacemaker Insertion"] == {"g1": ["1 week off.", "2 weeks off."]}
+    assert cardio.unchanged == 8
+    assert cardio.conditions["Aneurysm (Thoracic >6.5cm)"]["ref"].startswith("G1 notify if >6.0cm.")
+
+
+def test_matching_and_new_chapters(first):
+    diabetes = chapter(first, DIABETES)
+    assert not diabetes.has_changes and diabetes.unchanged == 5
+    hearing = chapter(first, HEARING)
+    assert hearing.file is None and list(hearing.added) == ["Deafness"]
+    assert list(first.errors) == FAILING
+    assert CARDIO not in first.missing and DIABETES not in first.missing
+    assert len(first.missing) == 6
+
+
+def test_rerun_parses_only_the_failed_page(dirs, first):
+    second = ingest(*dirs, workers=WORKERS)
+    assert second.parsed == FAILING and second.skipped == GOOD
+    assert second.as_dict() == first.as_dict() | {"parsed": FAILING, "skipped": GOOD}
+
+
+def test_parser_change_reparses_every_page(dirs, first, monkeypatch):
+    monkeypatch.setattr(dvla.ingest, "PARSER_VERSION", dvla.ingest.PARSER_VERSION + 1)
+    assert ingest(*dirs, workers=WORKERS).parsed == PAGES
+
+
+def test_edited_page_is_reparsed(dirs, first):
+    page = dirs[0] / "03_diabetes.html"
+    page.write_text(page.read_text().replace("Stop driving.</td><td>Stop driving.", "Stop driving.</td><td>Revoked."))
+    report = ingest(*dirs, workers=WORKERS)
+    assert report.parsed == ["03_diabetes.html", *FAILING]
+    assert chapter(report, DIABETES).changed == {"Hypo Unawareness": {"g2": ["Stop driving.", "Revoked."]}}
+
+
+def test_invalid_chapter_stops_apply_before_any_write(dirs, first):
+    guidelines = dirs[1]
+    hearing = chapter(first, HEARING)
+    broken = first._replace(chapters=[d if d is not hearing else d._replace(url=None) for d in first.chapters])
+    before = {p.name: p.read_bytes() for p in guidelines.iterdir()}
+    with pytest.raises(GuidelineError):
+        apply(broken, guidelines, version="broken")
+    assert {p.name: p.read_bytes() for p in guidelines.iterdir()} == before
+
+
+def test_apply_leaves_nothing_to_diff(dirs, first):
+    guidelines = dirs[1]
+    written = apply(first, guidelines, version="fixture")
+    # The unchanged diabetes chapter is not rewritten.
+    assert sorted(written) == ["02_cardiovascular_syncope_tloc.json", "09_hearing_assessing_fitness_to_drive.json"]
+    data = GuidelineStore(guidelines).snapshot.data
+    assert HEARING in data and "Long QT Syndrome" in data[CARDIO]["conditions"]
+    assert not any(d.has_changes for d in ingest(*dirs, workers=WORKERS).chapters)
@@ -0,0 +1,83 @@
+"""Every Appendix D answer combination against the published tables.
+
+PUBLISHED is an independent, cell-by-cell transcription of the Appendix D
+tables in sections 3-6, kept apart from the rules in dvla/tloc.py.
+"""
+import pytest
+
+from dvla.resume import DATED, NO_RESTRICTION
+from dvla.tloc import all_answers, compile_table
+
+# (pathway, group, multiple, variant) -> (must notify, period, subject to specialist report)
+# period: "0" = may drive / resume after recovery, "3m" / "5y" = fixed, "refer" = other standard applies
+PUBLISHED = {
+    # 3. Reflex syncope with a reliable prodrome
+    ("reflex_prodrome", 1, False, "not_driving"): (False, "0", False),
+    ("reflex_prodrome", 1, False, "driving"): (False, "1m", False),
+    ("reflex_prodrome", 1, True, "not_driving"): (False, "0", False),
+    ("reflex_prodrome", 1, True, "driving"): (True, "3m", False),
+    ("reflex_prodrome", 2, False, "safe"): (True, "0", False),
+    ("reflex_prodrome", 2, False, "unsafe"): (True, "3m", True),
+    ("reflex_prodrome", 2, True, "safe"): (True, "0", False),
+    ("reflex_prodrome", 2, True, "unsafe"): (True, "6m", True),
+    # 3. Reflex syncope without a reliable prodrome
+    ("reflex_no_prodrome", 1, False, "safe"): (True, "0", False),
+    ("reflex_no_prodrome", 1, False, "unsafe"): (True, "3m", False),
+    ("reflex_no_prodrome", 1, True, "safe"): (True, "3m", False),
+    ("reflex_no_prodrome", 1, True, "unsafe"): (True, "6m", False),
+    ("reflex_no_prodrome", 2, False, "safe"): (True, "3m", True),
+    ("reflex_no_prodrome", 2, False, "unsafe"): (True, "12m", True),
+    ("reflex_no_prodrome", 2, True, "any"): (True, "12m", True),
+    # 4. Unexplained loss of consciousness
+    ("unexplained", 1, False, "any"): (True, "6m", False),
+    ("unexplained", 1, True, "any"): (True, "12m", False),
+    ("unexplained", 2, False, "any"): (True, "12m", False),
+    ("unexplained", 2, True, "any"): (True, "5y", False),
+    # 5. Blackouts with seizure markers
+    ("seizure_markers", 1, False, "low"): (True, "6m", False),
+    ("seizure_markers", 1, False, "high"): (True, "12m", False),
+    ("seizure_markers", 2, False, "any"): (True, "5y", False),
+    ("seizure_markers", 1, True, "any"): (True, "refer", False),
+    ("seizure_markers", 2, True, "any"): (True, "refer", False),
+    # 6. Cough syncope
+    ("cough", 1, False, "any"): (True, "6m", False),
+    ("cough", 1, True, "any"): (True, "12m", False),
+    ("cough", 2, False, "any"): (True, "12m", False),
+    ("cough", 2, True, "any"): (True, "5y", False),
+}
+
+
+def variant(a):
+    if a.pathway == "reflex_prodrome" and a.group == 1:
+        return "driving" if a.while_driving else "not_driving"
+    if a.pathway.startswith("reflex") and not (a.pathway == "reflex_no_prodrome" and a.group == 2 and a.multiple):
+        return "safe" if a.provoked and not a.while_driving else "unsafe"
+    if a.pathway == "seizure_markers" and a.group == 1 and not a.multiple:
+        return "high" if a.high_risk else "low"
+    return "any"
+
+
+def period(decision):
+    iv = decision.interval
+    if iv.status == NO_RESTRICTION:
+        return "0"
+    if iv.status == DATED:
+        return f"{iv.low}{iv.unit[0]}"
+    return "refer"
+
+
+ANSWERS = list(all_answers())
+TABLE = compile_table()
+
+
+@pytest.mark.parametrize("a", ANSWERS, ids=lambda a: "-".join(map(str, a)))
+def test_matches_published_table(a):
+    cell = (a.pathway, a.group, a.multiple, variant(a))
+    assert cell in PUBLISHED, f"no published cell {cell}"
+    d = TABLE[a]
+    assert (d.notify, period(d), d.subject_to_report) == PUBLISHED[cell]
+
+
+def test_every_published_cell_reached():
+    reached = {(a.pathway, a.group, a.multiple, variant(a)) for a in ANSWERS}
+    assert set(PUBLISHED) - reached == set()